@@ -0,0 +1,214 @@
+import argparse
+from collections import Counter
+from datetime import date, timedelta
+
+from config import DB_CONFIG
+from skill_index import parse_skills
+from storage import create_storage, dialect_of
+
+# Daily rollups of search_tracking. Platform totals are kept separately
+# from per-skill counts because one event can carry several skills.
+ROLLUP_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_state (
+        name VARCHAR(100) PRIMARY KEY,
+        last_id BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS search_platform_daily (
+        day DATE NOT NULL,
+        platform VARCHAR(100) NOT NULL,
+        searches INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, platform)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS search_skill_daily (
+        day DATE NOT NULL,
+        platform VARCHAR(100) NOT NULL,
+        skill VARCHAR(191) NOT NULL,
+        searches INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, platform, skill)
+    )
+    ''',
+    "INSERT IGNORE INTO rollup_state (name, last_id) VALUES ('search_tracking', 0)"
+]
+
+# SQLite has no ON UPDATE; refresh_search_rollups sets updated_at itself
+SQLITE_ROLLUP_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS rollup_state (
+        name TEXT PRIMARY KEY,
+        last_id INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS search_platform_daily (
+        day DATE NOT NULL,
+        platform TEXT NOT NULL,
+        searches INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, platform)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS search_skill_daily (
+        day DATE NOT NULL,
+        platform TEXT NOT NULL,
+        skill TEXT NOT NULL,
+        searches INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, platform, skill)
+    ) WITHOUT ROWID
+    ''',
+    "INSERT OR IGNORE INTO rollup_state (name, last_id) VALUES ('search_tracking', 0)"
+]
+
+DEFAULT_BATCH_SIZE = 5000
+# Rows younger than this are left for the next run, so an insert that
+# got a lower id but commits late isn't skipped by the high-water mark
+DEFAULT_LAG_SECONDS = 5
+
+GROUPINGS = ('platform', 'skill', 'day')
+MAX_DAYS = 366
+
+
+# Folds search_tracking rows past the high-water mark into the rollups,
+# batch by batch. The state row is locked for each batch, so concurrent
+# runs from several workers serialize instead of double counting. SQLite
+# has no row locks, so there the batch takes the database write lock.
+def refresh_search_rollups(conn, batch_size=DEFAULT_BATCH_SIZE, lag_seconds=DEFAULT_LAG_SECONDS):
+    sqlite = dialect_of(conn) == 'sqlite'
+    processed = 0
+    cursor = conn.cursor()
+    try:
+        while True:
+            if sqlite:
+                conn.begin_immediate()
+                cursor.execute("SELECT last_id FROM rollup_state WHERE name = 'search_tracking'")
+            else:
+                cursor.execute("SELECT last_id FROM rollup_state WHERE name = 'search_tracking' FOR UPDATE")
+            row = cursor.fetchone()
+            last_id = row[0] if row else 0
+
+            if sqlite:
+                cursor.execute('''
+                    SELECT id, DATE(search_date), platform, skills
+                    FROM search_tracking
+                    WHERE id > %s AND search_date < DATETIME('now', %s)
+                    ORDER BY id
+                    LIMIT %s
+                ''', (last_id, f'-{int(lag_seconds)} seconds', int(batch_size)))
+            else:
+                cursor.execute('''
+                    SELECT id, DATE(search_date), platform, skills
+                    FROM search_tracking
+                    WHERE id > %s AND search_date < NOW() - INTERVAL %s SECOND
+                    ORDER BY id
+                    LIMIT %s
+                ''', (last_id, int(lag_seconds), int(batch_size)))
+            rows = cursor.fetchall()
+            if not rows:
+                conn.rollback()
+                return processed
+
+            platform_counts = Counter()
+            skill_counts = Counter()
+            for _, day, platform, skills in rows:
+                platform_counts[(day, platform)] += 1
+                for skill in parse_skills(skills):
+                    skill_counts[(day, platform, skill[:191])] += 1
+
+            _upsert_counts(cursor, 'search_platform_daily', ('day', 'platform'), platform_counts)
+            _upsert_counts(cursor, 'search_skill_daily', ('day', 'platform', 'skill'), skill_counts)
+            cursor.execute("UPDATE rollup_state SET last_id = %s, updated_at = CURRENT_TIMESTAMP "
+                           "WHERE name = 'search_tracking'", (rows[-1][0],))
+            conn.commit()
+
+            processed += len(rows)
+            if len(rows) < batch_size:
+                return processed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def _upsert_counts(cursor, table, key_columns, counts):
+    if not counts:
+        return
+    columns = ', '.join(key_columns + ('searches',))
+    row_placeholder = '(' + ', '.join(['%s'] * (len(key_columns) + 1)) + ')'
+    params = [value for key, count in counts.items() for value in key + (count,)]
+    cursor.execute(f'''
+        INSERT INTO {table} ({columns})
+        VALUES {', '.join([row_placeholder] * len(counts))}
+        ON DUPLICATE KEY UPDATE searches = searches + VALUES(searches)
+    ''', params)
+
+
+# Aggregates over the rollups only, so cost depends on the number of
+# (day, platform, skill) buckets in the window, not on raw event volume
+def query_search_counts(cursor, group_by='platform', days=30, platform=None, limit=20):
+    since = date.today() - timedelta(days=days - 1)
+    params = [since]
+    platform_filter = ''
+    if platform:
+        platform_filter = 'AND platform = %s'
+        params.append(platform)
+
+    if group_by == 'skill':
+        sql = f'''
+            SELECT skill, SUM(searches) AS searches FROM search_skill_daily
+            WHERE day >= %s {platform_filter}
+            GROUP BY skill ORDER BY searches DESC, skill LIMIT %s
+        '''
+        params.append(limit)
+    elif group_by == 'day':
+        sql = f'''
+            SELECT day, SUM(searches) AS searches FROM search_platform_daily
+            WHERE day >= %s {platform_filter}
+            GROUP BY day ORDER BY day
+        '''
+    else:
+        sql = f'''
+            SELECT platform, SUM(searches) AS searches FROM search_platform_daily
+            WHERE day >= %s {platform_filter}
+            GROUP BY platform ORDER BY searches DESC, platform LIMIT %s
+        '''
+        params.append(limit)
+
+    cursor.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    results = []
+    for row in cursor.fetchall():
+        row = dict(zip(columns, row)) if not isinstance(row, dict) else dict(row)
+        row['searches'] = int(row['searches'])
+        if group_by == 'day':
+            # SQLite hands back SUM/GROUP BY dates as text
+            day = row['day']
+            row['day'] = day if isinstance(day, str) else day.isoformat()
+        results.append(row)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Refresh search analytics rollups')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--lag-seconds', type=int, default=DEFAULT_LAG_SECONDS)
+    args = parser.parse_args(argv)
+
+    storage = create_storage(DB_CONFIG)
+
+    conn = storage.connect()
+    try:
+        processed = refresh_search_rollups(conn, args.batch_size, args.lag_seconds)
+    finally:
+        conn.close()
+    print(f"📊 Rolled up {processed} search events")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,287 +1,307 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Blueprint, Flask, Response, abort, current_app, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from werkzeug.security import generate_password_hash, check_password_hash
-import mysql.connector
-from mysql.connector import Error
+import atexit
+import hashlib
+import io
 import json
+import logging
 import os
-import re
-from datetime import datetime
-import uuid
-import PyPDF2
-import docx
-
-app = Flask(__name__)
-CORS(app)
-
-# MySQL database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': 'Kal78048',  # Password for XAMPP
-    'database': 'IC1'
-}
-
-# Database initialization with better error handling
-def init_db():
-    conn = None
-    try:
-        print("🔧 Attempting to connect to MySQL...")
-        
-        # First try to connect without database
-        conn = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
-        cursor = conn.cursor()
-        
-        print("✅ Connected to MySQL server")
-        
-        # Create database if not exists
-        cursor.execute("CREATE DATABASE IF NOT EXISTS InternConnect")
-        cursor.close()
-        
-        # Reconnect to the specific database
-        conn.close()
-        conn = mysql.connector.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        print("✅ Database created/selected successfully")
-        
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                name VARCHAR(255) NOT NULL,
-                phone VARCHAR(20) NOT NULL,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                skills TEXT,
-                password_hash TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        print("✅ Users table created/verified")
-        
-        # Internships table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS internships (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                title VARCHAR(255) NOT NULL,
-                company VARCHAR(255) NOT NULL,
-                location VARCHAR(255) NOT NULL,
-                type VARCHAR(100) NOT NULL,
-                duration VARCHAR(100) NOT NULL,
-                stipend VARCHAR(100) NOT NULL,
-                description TEXT NOT NULL,
-                skills_required TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        print("✅ Internships table created/verified")
-        
-        # Applications table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS applications (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                user_id INT NOT NULL,
-                internship_id INT NOT NULL,
-                status VARCHAR(50) DEFAULT 'Applied',
-                applied_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                FOREIGN KEY (internship_id) REFERENCES internships (id) ON DELETE CASCADE,
-                UNIQUE(user_id, internship_id)
-            )
-        ''')
-        print("✅ Applications table created/verified")
-        
-        # Search tracking table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS search_tracking (
-                id INT PRIMARY KEY AUTO_INCREMENT,
-                user_id INT NOT NULL,
-                platform VARCHAR(100) NOT NULL,
-                skills TEXT NOT NULL,
-                search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-            )
-        ''')
-        print("✅ Search tracking table created/verified")
-        
-        # Insert sample internships - Use a fresh cursor for this operation
-        cursor.close()
-        cursor = conn.cursor()
-        
-        sample_internships = [
-            ("Frontend Developer Intern", "TechCorp Solutions", "San Francisco, CA", "Remote", "3 months", "$3,000/month", 
-             "Join our frontend team to build responsive web applications using React, JavaScript, and modern CSS frameworks.",
-             "JavaScript,React,HTML,CSS"),
-            
-            ("Data Science Intern", "DataInsights Inc.", "New York, NY", "Hybrid", "6 months", "$4,500/month",
-             "Work with our data team to analyze large datasets and build predictive models using Python and machine learning libraries.",
-             "Python,Machine Learning,SQL,Pandas"),
-            
-            ("UX/UI Design Intern", "CreativeMinds Agency", "Austin, TX", "On-site", "4 months", "$2,800/month",
-             "Design intuitive user interfaces for web and mobile applications. Collaborate with developers to implement designs.",
-             "Figma,UI/UX Design,Wireframing,Prototyping"),
-            
-            ("Backend Developer Intern", "ServerStack Technologies", "Seattle, WA", "Remote", "5 months", "$3,500/month",
-             "Develop and maintain server-side applications using Node.js and MongoDB. Implement RESTful APIs and database schemas.",
-             "Node.js,MongoDB,Express,REST APIs"),
-            
-            ("Marketing Intern", "GrowthHackers Marketing", "Chicago, IL", "Hybrid", "3 months", "$2,500/month",
-             "Assist in developing marketing campaigns, analyzing performance metrics, and creating content for social media channels.",
-             "Digital Marketing,Social Media,Content Creation,Analytics"),
-            
-            ("Cybersecurity Intern", "SecureNet Systems", "Boston, MA", "On-site", "6 months", "$4,000/month",
-             "Learn about network security, vulnerability assessment, and ethical hacking techniques under expert supervision.",
-             "Network Security,Ethical Hacking,Linux,Python")
-        ]
-        
-        # Insert each internship individually with duplicate check
-        inserted_count = 0
-        for internship in sample_internships:
-            try:
-                # Use a fresh cursor for each check and insert
-                check_cursor = conn.cursor()
-                check_cursor.execute('SELECT id FROM internships WHERE title = %s AND company = %s', (internship[0], internship[1]))
-                result = check_cursor.fetchone()
-                check_cursor.close()
-                
-                if not result:
-                    insert_cursor = conn.cursor()
-                    insert_cursor.execute('''
-                        INSERT INTO internships 
-                        (title, company, location, type, duration, stipend, description, skills_required)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ''', internship)
-                    insert_cursor.close()
-                    inserted_count += 1
-                    print(f"✅ Added internship: {internship[0]} at {internship[1]}")
-            except Error as e:
-                print(f"⚠️ Error inserting internship {internship[0]}: {e}")
-                continue
-        
-        print(f"📊 Inserted {inserted_count} new internships")
-        
-        # Create indexes for better performance
-        cursor = conn.cursor()
-        indexes = [
-            'CREATE INDEX idx_applications_user_id ON applications(user_id)',
-            'CREATE INDEX idx_applications_internship_id ON applications(internship_id)',
-            'CREATE INDEX idx_applications_status ON applications(status)',
-            'CREATE INDEX idx_users_email ON users(email)',
-            'CREATE INDEX idx_search_tracking_user_id ON search_tracking(user_id)'
-        ]
-        
-        for index_sql in indexes:
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+import zipfile
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from config import DB_CONFIG
+from storage import DATABASE_ERRORS, StorageUnavailable, TimedCursor, create_storage, is_duplicate_key
+from repositories import (APPLY_OUTCOMES, ApplicationRepository, IdempotencyRepository, InternshipRepository,
+                          ResumeJobRepository, SearchRepository, UserRepository)
+from event_sink import BufferedEventSink
+from logging_config import configure_logging
+from metrics import CONTENT_TYPE, REGISTRY, Counter, Gauge, Histogram
+from ingest import detect_format, import_internships, iter_records
+from migrations import LATEST_VERSION, current_version, migrate
+from analytics import GROUPINGS, MAX_DAYS
+from cache import MISSING, Cache
+from passwords import AttemptLimiter, PasswordHasher, RateLimited
+from pagination import (APPLICATION_FIELDS, APPLICATION_KEY, USER_FIELDS, USER_KEY, decode_keyset,
+                        iter_ndjson, paginate, parse_limit, select_list)
+from resume_analyzer import (MAX_UPLOAD_BYTES, RESUME_EXTENSIONS, UploadTooLarge, analysis_version, analyze_resume_bytes,
+                             cacheable, iter_zip_resumes, keyword_matcher, read_upload, zip_resume_entries)
+from resume_cache import ResumeResultCache
+from resume_match import AVAILABLE as MATCHING_AVAILABLE, ResumeMatcher
+from resume_jobs import QueueFullError, ResumeJobQueue
+from search import search_terms
+from static_assets import StaticAssets, etag_matches
+from recommend import (SCORE_PRECISION, decode_cursor, encode_cursor, parse_page_size, score_internships,
+                       skill_weights, top_k)
+
+configure_logging()
+logger = logging.getLogger('internconnect')
+
+# Routes live on a blueprint; create_app() at the bottom builds the app
+api = Blueprint('api', __name__)
+
+# Storage engine from DB_ENGINE: a MySQL connection pool sized per worker
+# process (default), or a SQLite file at SQLITE_PATH for single-node
+# deployments and CI
+storage = create_storage(DB_CONFIG)
+
+# Schema changes are applied by `python migrations.py`, not at import.
+# The first pooled connection only compares the recorded version.
+schema_checked = threading.Event()
+
+def check_schema_version(conn):
+    try:
+        version = current_version(conn)
+        conn.rollback()
+    except DATABASE_ERRORS as e:
+        logger.warning('Could not read schema version: %s', e)
+        return
+    schema_checked.set()
+    if version < LATEST_VERSION:
+        logger.warning('Database schema is at version %s, expected %s. Run: python migrations.py',
+                       version, LATEST_VERSION)
+
+# Per-query timings, labelled by statement verb and table
+db_queries = Counter('db_queries_total', 'SQL statements executed', ['statement', 'outcome'])
+db_query_seconds = Histogram('db_query_duration_seconds', 'Time spent in cursor.execute', ['statement'])
+
+def observe_query(statement, seconds, ok):
+    db_queries.inc(statement=statement, outcome='ok' if ok else 'error')
+    db_query_seconds.observe(seconds, statement=statement)
+
+# Borrow a connection and cursor for the duration of a with-block. Any
+# exception rolls back, and the connection always goes back to the engine.
+@contextmanager
+def db_cursor(dictionary=True, timeout=None):
+    with ExitStack() as resources:
+        try:
+            conn = resources.enter_context(storage.connection(timeout))
+        except DATABASE_ERRORS as e:
+            logger.error('Database connection error: %s', e)
+            raise StorageUnavailable('Database connection failed') from e
+        
+        if not schema_checked.is_set():
+            check_schema_version(conn)
+        
+        cursor = TimedCursor(conn.cursor(dictionary=dictionary), observe_query)
+        try:
+            yield conn, cursor
+        finally:
             try:
-                cursor.execute(index_sql)
-                print(f"✅ Created index: {index_sql.split('ON')[1].strip()}")
-            except Error as e:
-                if "duplicate key" in str(e).lower() or "already exists" in str(e).lower():
-                    print(f"ℹ️ Index already exists: {index_sql.split('ON')[1].strip()}")
-                else:
-                    print(f"⚠️ Could not create index: {e}")
-        
-        conn.commit()
-        print("🎉 Database initialization completed successfully!")
-        
-    except Error as e:
-        print(f"❌ Database initialization error: {e}")
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
-            print("🔒 Database connection closed")
+                cursor.close()
+            except DATABASE_ERRORS:
+                pass
+
+users = UserRepository(db_cursor)
+internships = InternshipRepository(db_cursor)
+applications = ApplicationRepository(db_cursor)
+searches = SearchRepository(db_cursor)
+idempotency_keys = IdempotencyRepository(db_cursor, timedelta(hours=float(os.environ.get('IDEMPOTENCY_TTL_HOURS', 24))))
+
+# Read-through caches. Per-user views get a short TTL because writes
+# handled by other worker processes can't invalidate this one's copy;
+# internship views are also keyed by their view_version, so a stale copy
+# is never served once the version moves on.
+CACHE_SIZE = int(os.environ.get('CACHE_SIZE', 1024))
+user_skills_cache = Cache('user_skills', maxsize=CACHE_SIZE, ttl=float(os.environ.get('USER_CACHE_TTL', 300)))
+internship_view_cache = Cache('internship_views', maxsize=CACHE_SIZE, ttl=float(os.environ.get('VIEW_CACHE_TTL', 30)))
+catalog_cache = Cache('catalog', maxsize=16, ttl=float(os.environ.get('CATALOG_CACHE_TTL', 300)))
+platform_cache = Cache('external_platforms', maxsize=CACHE_SIZE)
+# Table row estimates for /api/test-db
+table_stats_cache = Cache('table_stats', maxsize=1, ttl=float(os.environ.get('TABLE_STATS_TTL', 60)))
+CACHES = [user_skills_cache, internship_view_cache, catalog_cache, platform_cache, table_stats_cache]
+
+# Invalidation hooks - call after any write that changes what a user sees
+def invalidate_user(user_id):
+    user_id = str(user_id)
+    user_skills_cache.delete(user_id)
+    internship_view_cache.delete_where(lambda key: key[0] == user_id)
+
+def invalidate_catalog():
+    internship_view_cache.clear()
+    catalog_cache.clear()
 
-# Database helper function for MySQL
-def get_db_connection():
+# Parsed skill list for a user, or None if the user doesn't exist
+def load_user_skills(user_id):
+    return user_skills_cache.get_or_load(str(user_id), lambda: users.get_skills(user_id))
+
+# Password hashing runs on its own process pool. Login verification is
+# rate limited per account (per worker process) before any hashing work.
+password_hasher = PasswordHasher(
+    workers=int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2)),
+    timeout=float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+)
+login_limiter = AttemptLimiter(
+    burst=int(os.environ.get('LOGIN_BURST', 5)),
+    window=float(os.environ.get('LOGIN_WINDOW_SECONDS', 60))
+)
+password_hash_seconds = Histogram('password_hash_duration_seconds', 'Password hash/verify time, including pool wait',
+                                  ['operation'])
+
+def timed_password_op(operation, fn, *args):
+    started = time.perf_counter()
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
-    except Error as e:
-        print(f"❌ Database connection error: {e}")
-        return None
+        return fn(*args)
+    finally:
+        password_hash_seconds.observe(time.perf_counter() - started, operation=operation)
+
+# Resume parse time, split into text extraction and keyword analysis
+resume_analyses = Counter('resume_analyses_total', 'Resume analyses by mode and outcome', ['mode', 'outcome'])
+resume_extract_seconds = Histogram('resume_extract_duration_seconds', 'Time spent extracting resume text', ['mode'])
+resume_analyze_seconds = Histogram('resume_analyze_duration_seconds', 'Time spent scoring extracted resume text', ['mode'])
+
+def observe_resume(mode, outcome, timings):
+    resume_analyses.inc(mode=mode, outcome=outcome)
+    if 'extract_seconds' in timings:
+        resume_extract_seconds.observe(timings['extract_seconds'], mode=mode)
+        resume_analyze_seconds.observe(timings['analyze_seconds'], mode=mode)
+
+# Background resume analysis (POST /api/analyze-resume?mode=async). Job
+# state is written through to the database, so a poll can be answered by
+# any gunicorn worker, not only the one running the job.
+RESUME_JOB_TTL = float(os.environ.get('RESUME_JOB_TTL', 600))
+resume_jobs = ResumeJobQueue(
+    workers=int(os.environ.get('RESUME_WORKERS', os.cpu_count() or 2)),
+    timeout=float(os.environ.get('RESUME_JOB_TIMEOUT', 30)),
+    max_pending=int(os.environ.get('RESUME_QUEUE_SIZE', 100)),
+    result_ttl=RESUME_JOB_TTL,
+    on_finished=lambda status, timings: observe_resume('async', status, timings),
+    store=ResumeJobRepository(db_cursor, RESUME_JOB_TTL)
+)
+
+# Search tracking write-behind buffer
+search_events = BufferedEventSink(
+    searches.insert_events,
+    batch_size=int(os.environ.get('TRACKING_BATCH_SIZE', 100)),
+    flush_interval=float(os.environ.get('TRACKING_FLUSH_MS', 500)) / 1000,
+    capacity=int(os.environ.get('TRACKING_BUFFER_SIZE', 10000)),
+    put_timeout=float(os.environ.get('TRACKING_PUT_TIMEOUT_MS', 50)) / 1000,
+    name='search-tracking'
+)
 
-# Initialize database on startup
-init_db()
+# Resume results keyed by upload hash + analyzer version. Set
+# RESUME_CACHE_DB to a file path to keep results across restarts.
+resume_results = ResumeResultCache(
+    analysis_version(),
+    memory_size=int(os.environ.get('RESUME_CACHE_SIZE', 256)),
+    db_path=os.environ.get('RESUME_CACHE_DB')
+)
+
+# Catalog internships matched against each resume analysis's keywords.
+# Needs NumPy; the matrix is built on first use and picks up imported
+# rows at most every MATCH_REFRESH_SECONDS.
+resume_matcher = ResumeMatcher(
+    keyword_matcher,
+    internships.match_documents,
+    refresh_interval=float(os.environ.get('MATCH_REFRESH_SECONDS', 30))
+) if MATCHING_AVAILABLE else None
+
+# Frontend files, held in memory and compressed on first request.
+# STATIC_DIR defaults to the repo's frontend/ directory;
+# STATIC_AUTO_RELOAD=1 picks up edits without a restart.
+static_assets = StaticAssets(
+    os.environ.get('STATIC_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend')),
+    index=os.environ.get('STATIC_INDEX', 'Project.html'),
+    auto_reload=os.environ.get('STATIC_AUTO_RELOAD') == '1'
+)
 
 # Test endpoint
-@app.route('/api/test-db', methods=['GET'])
+# Row counts are estimates from the engine's catalog (see
+# storage.table_stats) rather than a full scan per table, and are cached.
+# `estimate` says how to read them: 'approximate' on MySQL, 'upper_bound'
+# on SQLite.
+@api.route('/api/test-db', methods=['GET'])
 def test_db():
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-    
-    cursor = None
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check tables
-        cursor.execute("SHOW TABLES")
-        tables = [table['Tables_in_InternConnect'] for table in cursor.fetchall()]
-        
-        # Count records in each table
-        counts = {}
-        for table in tables:
-            count_cursor = conn.cursor(dictionary=True)
-            count_cursor.execute(f"SELECT COUNT(*) as count FROM {table}")
-            result = count_cursor.fetchone()
-            counts[table] = result['count'] if result else 0
-            count_cursor.close()
-        
+        counts = table_stats_cache.get_or_load('tables', load_table_stats)
         return jsonify({
             'success': True, 
             'message': 'Database connection working',
-            'tables': tables,
-            'counts': counts
+            'tables': list(counts),
+            'counts': counts,
+            'estimated': True,
+            'estimate': storage.row_estimate
         })
-    except Error as e:
+    except DATABASE_ERRORS as e:
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+
+def load_table_stats():
+    with db_cursor() as (conn, cursor):
+        return storage.table_stats(cursor)
+
+# Connection pool / storage engine stats endpoint
+@api.route('/api/db-pool', methods=['GET'])
+def db_pool_stats():
+    return jsonify({'success': True, 'pool': storage.stats()})
+
+# Cache hit/miss counters
+@api.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify({'success': True, 'caches': {cache.name: cache.stats() for cache in CACHES}})
+
+# Request metrics. The route label is the URL rule (e.g.
+# /api/analyze-resume/<job_id>), not the raw path, to keep series bounded.
+http_requests = Counter('http_requests_total', 'HTTP requests by route and status', ['method', 'route', 'status'])
+http_request_seconds = Histogram('http_request_duration_seconds', 'Time to produce a response', ['method', 'route'])
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_app_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    http_requests.inc(method=request.method, route=route, status=response.status_code)
+    http_request_seconds.observe(elapsed, method=request.method, route=route)
+    logger.debug('Request handled', extra={
+        'method': request.method, 'route': route, 'status': response.status_code,
+        'duration_ms': round(elapsed * 1000, 1)
+    })
+    return response
+
+if storage.dialect == 'mysql':
+    Gauge('db_pool_connections', 'Pooled connections by state',
+          lambda: {(state,): storage.stats()[state] for state in ('in_use', 'idle', 'waiting')}, ['state'])
+Gauge('cache_hits_total', 'Cache hits by cache',
+      lambda: {(cache.name,): cache.stats()['hits'] for cache in CACHES}, ['cache'], kind='counter')
+Gauge('cache_misses_total', 'Cache misses by cache',
+      lambda: {(cache.name,): cache.stats()['misses'] for cache in CACHES}, ['cache'], kind='counter')
+Gauge('resume_jobs_pending', 'Resume analysis jobs queued or running', lambda: resume_jobs.stats()['pending'])
+Gauge('login_rate_limited_total', 'Login attempts rejected by the per-account limiter',
+      lambda: login_limiter.stats()['limited'], kind='counter')
+Gauge('search_events_dropped_total', 'Search tracking events dropped by the write buffer',
+      lambda: search_events.stats()['dropped'], kind='counter')
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
 
 # User authentication endpoints
-@app.route('/api/signup', methods=['POST'])
+@api.route('/api/signup', methods=['POST'])
 def signup():
     data = request.get_json()
-    print("📨 Received signup data:", data)
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check if user already exists
-        cursor.execute('SELECT id FROM users WHERE email = %s', (data['email'],))
-        existing_user = cursor.fetchone()
-        
-        if existing_user:
+        if users.email_exists(data['email']):
             return jsonify({'success': False, 'message': 'User already exists with this email'}), 400
         
-        # Hash password
-        password_hash = generate_password_hash(data.get('password', 'default123'))
-        print("🔐 Password hashed")
+        # Hash password on the hashing pool, without holding a connection
+        try:
+            password_hash = timed_password_op('hash', password_hasher.hash, data.get('password', 'default123'))
+        except FutureTimeoutError:
+            return jsonify({'success': False, 'message': 'Server busy, try again shortly'}), 503
         
-        # Insert new user
-        cursor.execute('''
-            INSERT INTO users (name, phone, email, skills, password_hash)
-            VALUES (%s, %s, %s, %s, %s)
-        ''', (data['name'], data['phone'], data['email'], 
-              ','.join(data['skills']), password_hash))
+        # Insert new user and index their skills
+        user_id = users.create(data['name'], data['phone'], data['email'], data['skills'], password_hash)
+        logger.info('User signed up', extra={'user_id': user_id})
         
-        user_id = cursor.lastrowid
-        print("✅ User inserted with ID:", user_id)
-        
-        conn.commit()
+        invalidate_user(user_id)
         
         # Return user data (without password)
         user = {
@@ -294,37 +314,47 @@ def signup():
         
         return jsonify({'success': True, 'user': user})
         
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
-        if conn:
-            conn.rollback()
+    except DATABASE_ERRORS as e:
+        if is_duplicate_key(e):
+            # Lost a race with a concurrent signup for the same email
+            return jsonify({'success': False, 'message': 'User already exists with this email'}), 400
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
 
-@app.route('/api/login', methods=['POST'])
+@api.route('/api/login', methods=['POST'])
 def login():
     data = request.get_json()
-    print("📨 Received login data:", data)
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
+    # Throttle before any hashing so a burst against one account can't
+    # tie up the hashing pool
+    try:
+        login_limiter.acquire(data['email'].strip().lower())
+    except RateLimited as e:
+        response = jsonify({'success': False, 'message': str(e)})
+        response.headers['Retry-After'] = str(int(e.retry_after) + 1)
+        return response, 429
+    
     try:
-        cursor = conn.cursor(dictionary=True)
+        user = users.get_by_email(data['email'])
+        if not user:
+            return jsonify({'success': False, 'message': 'Invalid email or password'}), 401
         
-        # Find user by email
-        cursor.execute('SELECT * FROM users WHERE email = %s', (data['email'],))
-        user = cursor.fetchone()
+        try:
+            matches, new_hash = timed_password_op('verify', password_hasher.verify,
+                                                  user['password_hash'], data['password'])
+        except FutureTimeoutError:
+            return jsonify({'success': False, 'message': 'Server busy, try again shortly'}), 503
         
-        if not user or not check_password_hash(user['password_hash'], data['password']):
+        if not matches:
+            logger.info('Failed login', extra={'user_id': user['id']})
             return jsonify({'success': False, 'message': 'Invalid email or password'}), 401
         
+        if new_hash:
+            # Stored with older hash parameters; the compare-and-set skips
+            # the update if the password changed in the meantime
+            users.replace_password_hash(user['id'], user['password_hash'], new_hash)
+            logger.info('Upgraded password hash', extra={'user_id': user['id']})
+        
         # Return user data (without password)
         user_data = {
             'id': user['id'],
@@ -336,312 +366,539 @@ def login():
         
         return jsonify({'success': True, 'user': user_data})
         
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
 
 # Apply for internship endpoint
-@app.route('/api/apply', methods=['POST'])
+@api.route('/api/apply', methods=['POST'])
 def apply_for_internship():
     data = request.get_json()
     user_id = data.get('user_id')
-    internship_id = data.get('internship_id')
+    try:
+        internship_id = int(data.get('internship_id'))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'internship_id must be an integer'}), 400
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
     try:
-        cursor = conn.cursor(dictionary=True)
+        outcomes = applications.create_many(user_id, [internship_id])
+        if outcomes is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+        if outcomes[internship_id] == 'not_found':
+            return jsonify({'success': False, 'message': 'Internship not found'}), 404
+        if outcomes[internship_id] == 'already_applied':
+            return jsonify({'success': False, 'message': 'You have already applied for this internship'}), 400
         
-        # Check if already applied
-        cursor.execute('''
-            SELECT id FROM applications 
-            WHERE user_id = %s AND internship_id = %s
-        ''', (user_id, internship_id))
-        existing_application = cursor.fetchone()
+        invalidate_user(user_id)
         
-        if existing_application:
-            return jsonify({'success': False, 'message': 'You have already applied for this internship'}), 400
+        return jsonify({'success': True, 'message': 'Application submitted successfully'})
         
-        # Create application
-        cursor.execute('''
-            INSERT INTO applications (user_id, internship_id, status)
-            VALUES (%s, %s, 'Applied')
-        ''', (user_id, internship_id))
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# Batch apply: {"user_id": .., "internship_ids": [..]} with an optional
+# Idempotency-Key header. Reports an outcome per id (created,
+# already_applied or not_found). A retry with the same key replays the
+# stored response instead of running again.
+MAX_BATCH_APPLY = int(os.environ.get('MAX_BATCH_APPLY', 100))
+MAX_IDEMPOTENCY_KEY_LENGTH = 100
+
+@api.route('/api/applications/batch', methods=['POST'])
+def apply_batch():
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id')
+    internship_ids = data.get('internship_ids')
+    if not user_id or not isinstance(internship_ids, list) or not internship_ids:
+        return jsonify({'success': False, 'message': 'user_id and a non-empty internship_ids list are required'}), 400
+    if len(internship_ids) > MAX_BATCH_APPLY:
+        return jsonify({'success': False, 'message': f'At most {MAX_BATCH_APPLY} internship_ids per request'}), 400
+    try:
+        internship_ids = list(dict.fromkeys(int(internship_id) for internship_id in internship_ids))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'internship_ids must be integers'}), 400
+    
+    key = request.headers.get('Idempotency-Key')
+    if key is not None and not 0 < len(key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+        return jsonify({'success': False, 'message': f'Idempotency-Key must be 1-{MAX_IDEMPOTENCY_KEY_LENGTH} characters'}), 400
+    request_hash = hashlib.sha256(json.dumps([str(user_id), internship_ids]).encode('utf-8')).hexdigest()
+    
+    try:
+        if key:
+            stored = idempotency_keys.get(user_id, key)
+            if stored:
+                stored_hash, status_code, body = stored
+                if stored_hash != request_hash:
+                    return jsonify({'success': False, 'message': 'Idempotency-Key was already used for a different request'}), 422
+                response = jsonify(body)
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response, status_code
+        
+        outcomes = applications.create_many(user_id, internship_ids)
+        if outcomes is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
         
-        conn.commit()
+        summary = {outcome: 0 for outcome in APPLY_OUTCOMES}
+        for outcome in outcomes.values():
+            summary[outcome] += 1
+        if summary['created']:
+            invalidate_user(user_id)
         
-        return jsonify({'success': True, 'message': 'Application submitted successfully'})
+        body = {
+            'success': True,
+            'results': [{'internship_id': internship_id, 'status': outcomes[internship_id]}
+                        for internship_id in internship_ids],
+            'summary': summary
+        }
+        if key:
+            idempotency_keys.save(user_id, key, request_hash, 200, body)
+        return jsonify(body)
         
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
-        if conn:
-            conn.rollback()
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+
+# Conditional GETs for polled per-user views. The ETag is a digest of
+# everything the body depends on, so it is known before the body is built.
+def view_digest(*parts):
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()[:32]
+
+def with_etag(response, digest):
+    response.headers['ETag'] = f'W/"{digest}"'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 # Internship endpoints
-@app.route('/api/internships', methods=['GET'])
+@api.route('/api/internships', methods=['GET'])
 def get_internships():
     filter_type = request.args.get('filter', 'All')
     user_id = request.args.get('user_id')
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
+    if request.args.get('mode') == 'recommend':
+        return recommend_internships(user_id)
+    
     try:
-        cursor = conn.cursor(dictionary=True)
+        # The stamp is read before the view, so a write landing in between
+        # can only make the body newer than its tag: one extra full
+        # response on the next poll, never a stale 304
+        version = internships.view_version(user_id)
+        if version is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
         
-        # First get user skills
-        cursor.execute('SELECT skills FROM users WHERE id = %s', (user_id,))
-        user_row = cursor.fetchone()
+        digest = view_digest('internships', user_id, filter_type, version)
+        if etag_matches(request.headers.get('If-None-Match'), digest):
+            return with_etag(Response(status=304), digest)
         
-        if not user_row:
+        cache_key = (str(user_id), filter_type, version)
+        results = internship_view_cache.get(cache_key)
+        if results is MISSING:
+            user_skills = load_user_skills(user_id)
+            if user_skills is None:
+                return jsonify({'success': False, 'message': 'User not found'}), 404
+            
+            rows = internships.list_for_user(user_id, filter_type, bool(user_skills))
+            
+            results = []
+            for row in rows:
+                internship = dict(row)
+                internship['skills'] = internship['skills_required'].split(',')
+                results.append(internship)
+            
+            internship_view_cache.set(cache_key, results)
+        return with_etag(jsonify(results), digest)
+        
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+# Ranked recommendations: /api/internships?mode=recommend&user_id=..&limit=..&cursor=..
+# Scores every internship sharing a skill with the user, then loads full
+# rows only for the requested page.
+def recommend_internships(user_id):
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+        after = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        candidates = internships.recommendation_candidates(user_id)
+        if candidates is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
-        user_skills = user_row['skills'].split(',') if user_row['skills'] else []
+        user_skill_ids, internship_skills = candidates
+        if not internship_skills:
+            return jsonify({'success': True, 'internships': [], 'next_cursor': None})
         
-        if filter_type == 'All':
-            # Get all internships that match user skills
-            if user_skills:
-                # Build query with skill matching
-                skill_conditions = []
-                params = [user_id]
-                
-                for skill in user_skills[:3]:  # Limit to first 3 skills for performance
-                    skill_conditions.append("i.skills_required LIKE %s")
-                    params.append(f'%{skill}%')
-                
-                where_clause = " OR ".join(skill_conditions)
-                
-                cursor.execute(f'''
-                    SELECT i.*, 
-                           COALESCE(a.status, 'Available') as status,
-                           COALESCE(a.applied_date, '') as applied_date
-                    FROM internships i
-                    LEFT JOIN applications a ON i.id = a.internship_id AND a.user_id = %s
-                    WHERE {where_clause}
-                ''', params)
-            else:
-                # No skills specified, return all internships
-                cursor.execute('''
-                    SELECT i.*, 
-                           COALESCE(a.status, 'Available') as status,
-                           COALESCE(a.applied_date, '') as applied_date
-                    FROM internships i
-                    LEFT JOIN applications a ON i.id = a.internship_id AND a.user_id = %s
-                ''', (user_id,))
-        else:
-            # Get filtered internships that match user skills
-            if user_skills:
-                skill_conditions = []
-                params = [user_id, filter_type]
-                
-                for skill in user_skills[:3]:
-                    skill_conditions.append("i.skills_required LIKE %s")
-                    params.append(f'%{skill}%')
-                
-                where_clause = " OR ".join(skill_conditions)
-                
-                cursor.execute(f'''
-                    SELECT i.*, a.status, a.applied_date
-                    FROM internships i
-                    JOIN applications a ON i.id = a.internship_id
-                    WHERE a.user_id = %s AND a.status = %s AND ({where_clause})
-                ''', params)
-            else:
-                cursor.execute('''
-                    SELECT i.*, a.status, a.applied_date
-                    FROM internships i
-                    JOIN applications a ON i.id = a.internship_id
-                    WHERE a.user_id = %s AND a.status = %s
-                ''', (user_id, filter_type))
-        
-        internships = []
-        for row in cursor.fetchall():
+        weights = load_skill_weights()
+        scores = score_internships(user_skill_ids, internship_skills, weights)
+        page = top_k(scores, limit, after)
+        if not page:
+            return jsonify({'success': True, 'internships': [], 'next_cursor': None})
+        
+        rows = internships.with_status(user_id, [internship_id for internship_id, _ in page])
+        
+        results = []
+        for internship_id, score in page:
+            row = rows.get(internship_id)
+            if not row:
+                continue
             internship = dict(row)
             internship['skills'] = internship['skills_required'].split(',')
-            internships.append(internship)
+            internship['score'] = score
+            results.append(internship)
         
-        return jsonify(internships)
+        next_cursor = None
+        if len(page) == limit:
+            last_id, last_score = page[-1]
+            next_cursor = encode_cursor(last_score, last_id)
         
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
+        return jsonify({'success': True, 'internships': results, 'next_cursor': next_cursor})
+        
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
+
+# Free-text search: /api/internships/search?q=..&type=..&location=..&limit=..&cursor=..
+# Ranked by text relevance on the engine's full-text index, and paged
+# by a (score, id) keyset like recommendations
+@api.route('/api/internships/search', methods=['GET'])
+def search_internships_endpoint():
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({'success': False, 'message': 'q must contain at least one word'}), 400
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+        after = decode_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        matches = internships.search(terms, request.args.get('type'), request.args.get('location'), limit, after)
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
+        return jsonify({'success': False, 'message': str(e)}), 500
+    
+    # Rounded for display only; the cursor keeps the raw score it is
+    # compared against on the next page
+    results = []
+    for row, score in matches:
+        internship = dict(row)
+        internship['skills'] = internship['skills_required'].split(',')
+        internship['score'] = round(score, SCORE_PRECISION)
+        results.append(internship)
+    
+    next_cursor = None
+    if len(results) == limit:
+        next_cursor = encode_cursor(matches[-1][1], results[-1]['id'])
+    
+    return jsonify({'success': True, 'internships': results, 'next_cursor': next_cursor})
+
+# Bulk internship import: CSV or JSONL as a multipart 'file' or the raw body.
+# Set IMPORT_TOKEN to require a matching X-Import-Token header.
+@api.route('/api/internships/import', methods=['POST'])
+def import_internships_endpoint():
+    token = os.environ.get('IMPORT_TOKEN')
+    if token and request.headers.get('X-Import-Token') != token:
+        return jsonify({'success': False, 'message': 'Invalid import token'}), 403
+    
+    if 'file' in request.files:
+        upload = request.files['file']
+        stream, filename = upload.stream, upload.filename
+    else:
+        stream, filename = request.stream, None
+    
+    fmt = request.args.get('format') or detect_format(filename, request.content_type)
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'success': False, 'message': 'format must be csv or jsonl'}), 400
+    
+    try:
+        batch_size = int(request.args.get('batch_size', 1000))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'batch_size must be an integer'}), 400
+    
+    def progress(stats):
+        logger.info('Import progress', extra={key: stats[key] for key in ('written', 'invalid', 'rows_per_second')})
+    
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    try:
+        with db_cursor() as (conn, cursor):
+            stats = import_internships(conn, iter_records(text, fmt), batch_size, progress)
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
+        return jsonify({'success': False, 'message': str(e)}), 500
+    except UnicodeDecodeError:
+        return jsonify({'success': False, 'message': 'Input must be UTF-8'}), 400
     finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+        invalidate_catalog()
+    
+    return jsonify({'success': True, 'import': stats})
+
+# IDF weight of every skill in the catalog, cached until the catalog changes
+def load_skill_weights():
+    def load():
+        doc_freq, total = internships.skill_document_frequencies()
+        return skill_weights(doc_freq, total)
+    
+    return catalog_cache.get_or_load('skill_weights', load)
 
 # Get user applications
-@app.route('/api/applications', methods=['GET'])
+@api.route('/api/applications', methods=['GET'])
 def get_user_applications():
     user_id = request.args.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'message': 'user_id is required'}), 400
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute('''
-            SELECT a.*, i.title, i.company, i.location, i.type, i.stipend
-            FROM applications a
-            JOIN internships i ON a.internship_id = i.id
-            WHERE a.user_id = %s
-            ORDER BY a.applied_date DESC
-        ''', (user_id,))
+        columns = select_list(request.args.get('fields'), APPLICATION_FIELDS, APPLICATION_KEY)
+        after = decode_keyset(request.args.get('cursor'), (datetime.fromisoformat, int))
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    sql, params = applications.list_query(columns, user_id, after)
+    
+    try:
+        if request.args.get('format') == 'ndjson':
+            return stream_ndjson(sql, params)
         
-        applications = cursor.fetchall()
-        return jsonify({'success': True, 'applications': applications})
+        with db_cursor() as (conn, cursor):
+            cursor.execute(sql + ' LIMIT %s', params + [limit + 1])
+            page, next_cursor = paginate(cursor.fetchall(), limit, APPLICATION_KEY)
+        return jsonify({'success': True, 'applications': page, 'next_cursor': next_cursor})
         
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
 
 # Resume analysis endpoint
-@app.route('/api/analyze-resume', methods=['POST'])
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Caches an analysis unless the deadline cut it short (see cacheable)
+def remember_analysis(cache_key, analysis):
+    if cacheable(analysis):
+        resume_results.set(cache_key, analysis)
+
+# Internships returned with a resume analysis (?matches=N, 0 for none)
+DEFAULT_RESUME_MATCHES = int(os.environ.get('RESUME_MATCHES', 5))
+MAX_RESUME_MATCHES = 50
+
+def parse_match_count(value):
+    try:
+        count = int(value) if value else DEFAULT_RESUME_MATCHES
+    except ValueError:
+        raise ValueError('matches must be an integer')
+    return max(0, min(count, MAX_RESUME_MATCHES))
+
+# Best-matching catalog internships for an analysis, best first. Matching
+# is an extra, so a database error leaves it empty rather than failing
+# the analysis.
+def resume_matches(analysis, count):
+    if resume_matcher is None or not count:
+        return []
+    try:
+        top = resume_matcher.match(analysis['keyword_analysis']['technical_skills']['found'], count)
+        rows = internships.get_many([internship_id for internship_id, _ in top])
+    except DATABASE_ERRORS as e:
+        logger.warning('Resume matching skipped: %s', e)
+        return []
+    
+    results = []
+    for internship_id, score in top:
+        if internship_id in rows:
+            internship = dict(rows[internship_id])
+            internship['skills'] = internship['skills_required'].split(',')
+            internship['match_score'] = score
+            results.append(internship)
+    return results
+
+@api.route('/api/analyze-resume', methods=['POST'])
 def analyze_resume():
+    # Reject oversized bodies before the multipart form is parsed
+    if request.content_length and request.content_length > MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES:
+        return jsonify({'success': False, 'message': 'File is too large'}), 413
+    
     if 'file' not in request.files:
         return jsonify({'success': False, 'message': 'No file uploaded'}), 400
     
     file = request.files['file']
     
     try:
-        # Extract text from file
-        text = extract_text_from_file(file)
-        
-        # Analyze resume
-        analysis = analyze_resume_text(text)
+        match_count = parse_match_count(request.args.get('matches'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        data = read_upload(file)
+    except UploadTooLarge as e:
+        return jsonify({'success': False, 'message': str(e)}), 413
+    
+    # Re-uploads of the same file are answered from the result cache
+    cache_key = resume_results.key_for(file.filename, data)
+    cached = resume_results.get(cache_key)
+    
+    if request.args.get('mode') == 'async':
+        if cached is not None:
+            observe_resume('async', 'cached', {})
+            job_id = resume_jobs.add_completed(file.filename, cached)
+            return jsonify({'success': True, 'job_id': job_id, 'status': 'done', 'analysis': cached,
+                            'matches': resume_matches(cached, match_count)})
+        try:
+            job_id = resume_jobs.submit(file.filename, data,
+                                        on_complete=lambda analysis: remember_analysis(cache_key, analysis))
+        except QueueFullError as e:
+            return jsonify({'success': False, 'message': str(e)}), 503
+        return jsonify({'success': True, 'job_id': job_id, 'status': 'queued'}), 202
+    
+    if cached is not None:
+        observe_resume('sync', 'cached', {})
+        return jsonify({'success': True, 'analysis': cached, 'matches': resume_matches(cached, match_count)})
+    
+    try:
+        # Extract text page by page and analyze as it streams in
+        timings = {}
+        analysis = analyze_resume_bytes(file.filename, data, timings)
+        observe_resume('sync', 'done', timings)
+        remember_analysis(cache_key, analysis)
         
-        return jsonify({'success': True, 'analysis': analysis})
+        return jsonify({'success': True, 'analysis': analysis, 'matches': resume_matches(analysis, match_count)})
         
     except Exception as e:
+        observe_resume('sync', 'failed', {})
+        logger.exception('Resume analysis failed', extra={'upload_name': file.filename})
         return jsonify({'success': False, 'message': str(e)}), 500
 
-def extract_text_from_file(file):
-    filename = file.filename.lower()
-    
-    if filename.endswith('.pdf'):
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ''
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+# Bulk screening: ZIP archives and/or several files (form fields `files`
+# or `file`), analyzed on the resume pool with at most RESUME_BATCH_WINDOW
+# files in flight. One NDJSON line is streamed per file as it finishes,
+# in completion order, then a summary line. The form parser spools large
+# uploads to disk and archive members are read one at a time, so the
+# batch is never in memory as a whole.
+RESUME_BATCH_MAX_FILES = int(os.environ.get('RESUME_BATCH_MAX_FILES', 500))
+RESUME_BATCH_MAX_BYTES = int(os.environ.get('RESUME_BATCH_MAX_BYTES', 200 * 1024 * 1024))
+# 0 means two per resume pool worker
+RESUME_BATCH_WINDOW = int(os.environ.get('RESUME_BATCH_WINDOW', 0))
+
+@api.route('/api/analyze-resume/batch', methods=['POST'])
+def analyze_resume_batch():
+    if request.content_length and request.content_length > RESUME_BATCH_MAX_BYTES:
+        return jsonify({'success': False, 'message': 'Upload is too large'}), 413
     
-    elif filename.endswith(('.doc', '.docx')):
-        doc = docx.Document(file)
-        text = ''
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + '\n'
-        return text
+    uploads = request.files.getlist('files') + request.files.getlist('file')
+    if not uploads:
+        return jsonify({'success': False, 'message': 'No files uploaded'}), 400
     
-    elif filename.endswith('.txt'):
-        return file.read().decode('utf-8')
+    try:
+        # Matches are opt-in here, since a batch can hold hundreds of resumes
+        match_count = parse_match_count(request.args.get('matches') or '0')
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     
-    else:
-        raise ValueError('Unsupported file format')
-
-def analyze_resume_text(text):
-    score = 0
-    suggestions = []
-    
-    sections = {
-        'contact_info': r'\b(phone|email|contact|address)\b',
-        'education': r'\b(education|university|college|degree|bachelor|master)\b',
-        'experience': r'\b(experience|work|employment|internship|project)\b',
-        'skills': r'\b(skills|technical|programming|languages|tools)\b'
-    }
-    
-    found_sections = {}
-    for section, pattern in sections.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            found_sections[section] = True
-            score += 15
+    # (archive, entries) for ZIP uploads, (None, upload) for plain files
+    sources = []
+    total = 0
+    for upload in uploads:
+        if (upload.filename or '').lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(upload.stream)
+            except zipfile.BadZipFile:
+                return jsonify({'success': False, 'message': f'{upload.filename} is not a valid ZIP archive'}), 400
+            entries = zip_resume_entries(archive)
+            sources.append((archive, entries))
+            total += len(entries)
         else:
-            found_sections[section] = False
-            suggestions.append(f"Add a {section.replace('_', ' ')} section")
+            sources.append((None, upload))
+            total += 1
     
-    tech_keywords = [
-        'python', 'javascript', 'java', 'c++', 'react', 'node', 'sql', 'html', 'css',
-        'machine learning', 'data analysis', 'web development', 'api', 'git', 'linux'
-    ]
+    if not total:
+        return jsonify({'success': False, 'message': 'No resumes found in the upload'}), 400
+    if total > RESUME_BATCH_MAX_FILES:
+        return jsonify({'success': False, 'message': f'A batch holds at most {RESUME_BATCH_MAX_FILES} files'}), 400
     
-    found_keywords = []
-    for keyword in tech_keywords:
-        if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-            found_keywords.append(keyword)
+    def files():
+        index = 0
+        for archive, source in sources:
+            if archive is not None:
+                items = iter_zip_resumes(archive, source)
+            elif not (source.filename or '').lower().endswith(RESUME_EXTENSIONS):
+                items = [(source.filename, ValueError('Unsupported file format'))]
+            else:
+                try:
+                    items = [(source.filename, read_upload(source))]
+                except UploadTooLarge as e:
+                    items = [(source.filename, e)]
+            
+            for filename, data in items:
+                cache_key = resume_results.key_for(filename, data) if isinstance(data, bytes) else None
+                yield (index, filename, cache_key), filename, data
+                index += 1
     
-    keyword_score = min(len(found_keywords) * 3, 30)
-    score += keyword_score
+    def lookup(key):
+        return resume_results.get(key[2])
     
-    if len(found_keywords) < 5:
-        suggestions.append("Add more technical skills and keywords relevant to your target internships")
+    def generate():
+        dumps = current_app.json.dumps
+        started = time.monotonic()
+        counts = {'done': 0, 'failed': 0, 'timeout': 0, 'skipped': 0}
+        try:
+            for key, status, analysis, error, timings in resume_jobs.run_batch(files(), RESUME_BATCH_WINDOW, lookup):
+                index, filename, cache_key = key
+                observe_resume('batch', status, timings)
+                if status == 'done':
+                    remember_analysis(cache_key, analysis)
+                
+                line = {'index': index, 'filename': filename, 'status': 'done' if status == 'cached' else status}
+                if analysis is not None:
+                    line['cached'] = status == 'cached'
+                    line['analysis'] = analysis
+                    if match_count:
+                        line['matches'] = resume_matches(analysis, match_count)
+                else:
+                    line['error'] = error
+                counts[line['status']] += 1
+                yield dumps(line) + '\n'
+        except Exception as e:
+            # Headers are already sent, so the failure goes in the stream
+            logger.exception('Resume batch failed')
+            yield dumps({'error': str(e)}) + '\n'
+        
+        summary = dict(counts, files=total, seconds=round(time.monotonic() - started, 3))
+        yield dumps({'summary': summary}) + '\n'
     
-    word_count = len(text.split())
-    if word_count < 200:
-        suggestions.append("Resume seems too short. Add more details about your projects and experience")
-        score -= 10
-    elif word_count > 800:
-        suggestions.append("Resume might be too long. Consider condensing to 1-2 pages")
-        score -= 5
-    else:
-        score += 10
-    
-    if score >= 90:
-        category = "Excellent"
-    elif score >= 80:
-        category = "Good"
-    elif score >= 70:
-        category = "Fair"
-    elif score >= 60:
-        category = "Poor"
-    else:
-        category = "Needs Improvement"
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    for archive, _ in sources:
+        if archive is not None:
+            response.call_on_close(archive.close)
+    return response
+
+# Poll a background resume analysis job
+@api.route('/api/analyze-resume/<job_id>', methods=['GET'])
+def get_resume_job(job_id):
+    try:
+        job = resume_jobs.get(job_id)
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
+        return jsonify({'success': False, 'message': str(e)}), 500
+    if not job:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
     
-    keyword_analysis = {
-        'technical_skills': {
-            'found': found_keywords,
-            'missing': [k for k in tech_keywords if k not in found_keywords][:10]
-        },
-        'sections': {
-            'found': [k for k, v in found_sections.items() if v],
-            'missing': [k for k, v in found_sections.items() if not v]
-        }
-    }
+    try:
+        match_count = parse_match_count(request.args.get('matches'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     
-    return {
-        'ats_score': score,
-        'score_category': category,
-        'suggestions': suggestions[:5],
-        'keyword_analysis': keyword_analysis,
-        'word_count': word_count,
-        'sections_found': len([v for v in found_sections.values() if v])
-    }
+    body = {'success': job['status'] not in ('failed', 'timeout'), 'job': job}
+    if job.get('analysis'):
+        body['matches'] = resume_matches(job['analysis'], match_count)
+    return jsonify(body)
+
+@api.route('/api/resume-jobs/stats', methods=['GET'])
+def resume_job_stats():
+    return jsonify({'success': True, 'jobs': resume_jobs.stats(), 'results_cache': resume_results.stats(),
+                    'matcher': resume_matcher.stats() if resume_matcher else None})
 
 # Chat endpoint
-@app.route('/api/chat', methods=['POST'])
+@api.route('/api/chat', methods=['POST'])
 def chat():
     data = request.get_json()
     message = data.get('message', '').lower()
@@ -664,138 +921,260 @@ def chat():
     return jsonify({'response': response})
 
 # External internships search endpoint
-@app.route('/api/external-internships', methods=['GET'])
+@api.route('/api/external-internships', methods=['GET'])
 def get_external_internships():
     user_id = request.args.get('user_id')
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute('SELECT skills FROM users WHERE id = %s', (user_id,))
-        user_row = cursor.fetchone()
-        
-        if not user_row:
+        user_skills = load_user_skills(user_id)
+        if user_skills is None:
             return jsonify({'success': False, 'message': 'User not found'}), 404
         
-        user_skills = user_row['skills'].split(',') if user_row['skills'] else []
-        primary_skill = user_skills[0] if user_skills else 'intern'
+        # The body depends on nothing but the user's skills
+        digest = view_digest('external', user_skills)
+        if etag_matches(request.headers.get('If-None-Match'), digest):
+            return with_etag(Response(status=304), digest)
         
-        platforms = [
-            {
-                'name': 'LinkedIn',
-                'url': f"https://www.linkedin.com/jobs/search/?keywords={primary_skill}+intern+fresher+no+experience&f_AL=true&f_E=1&f_WT=2",
-                'description': 'Entry-level internships matching your skills'
-            },
-            {
-                'name': 'Naukri.com',
-                'url': f"https://www.naukri.com/{primary_skill}-internship-jobs?experience=0",
-                'description': 'Fresher internship opportunities'
-            },
-            {
-                'name': 'Glassdoor',
-                'url': f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={primary_skill}+intern&jobType=internship",
-                'description': 'Internship positions with company reviews'
-            },
-            {
-                'name': 'Internshala',
-                'url': f"https://internshala.com/internships/{primary_skill}-internship",
-                'description': 'Student-focused internship platform'
-            }
-        ]
+        primary_skill = user_skills[0] if user_skills else 'intern'
+        platforms = platform_cache.get_or_load(primary_skill, lambda: build_platform_links(primary_skill))
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'platforms': platforms,
             'user_skills': user_skills
-        })
+        }), digest)
         
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
 
-# Search tracking endpoint
-@app.route('/api/track-search', methods=['POST'])
+def build_platform_links(primary_skill):
+    return [
+        {
+            'name': 'LinkedIn',
+            'url': f"https://www.linkedin.com/jobs/search/?keywords={primary_skill}+intern+fresher+no+experience&f_AL=true&f_E=1&f_WT=2",
+            'description': 'Entry-level internships matching your skills'
+        },
+        {
+            'name': 'Naukri.com',
+            'url': f"https://www.naukri.com/{primary_skill}-internship-jobs?experience=0",
+            'description': 'Fresher internship opportunities'
+        },
+        {
+            'name': 'Glassdoor',
+            'url': f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={primary_skill}+intern&jobType=internship",
+            'description': 'Internship positions with company reviews'
+        },
+        {
+            'name': 'Internshala',
+            'url': f"https://internshala.com/internships/{primary_skill}-internship",
+            'description': 'Student-focused internship platform'
+        }
+    ]
+
+# Search tracking endpoint. Events are buffered in-process and written
+# in multi-row batches by a background thread (see event_sink.py).
+@api.route('/api/track-search', methods=['POST'])
 def track_search():
     data = request.get_json()
     user_id = data.get('user_id')
     platform = data.get('platform')
     skills = data.get('skills', [])
     
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
+    if not user_id or not platform:
+        return jsonify({'success': False, 'message': 'user_id and platform are required'}), 400
+    
+    # Checked before buffering, from the user cache, since the flusher can
+    # only drop events for unknown users after this request has returned
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute('''
-            INSERT INTO search_tracking (user_id, platform, skills)
-            VALUES (%s, %s, %s)
-        ''', (user_id, platform, ','.join(skills)))
-        
-        conn.commit()
-        
-        return jsonify({'success': True, 'message': 'Search tracked successfully'})
-        
-    except Error as e:
-        print("❌ MySQL Error:", str(e))
-        if conn:
-            conn.rollback()
+        if load_user_skills(user_id) is None:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
         return jsonify({'success': False, 'message': str(e)}), 500
+    
+    if not search_events.put((user_id, platform, ','.join(skills))):
+        return jsonify({'success': False, 'message': 'Search tracking is busy, try again shortly'}), 503
+    
+    return jsonify({'success': True, 'message': 'Search tracked successfully'})
+
+@api.route('/api/track-search/stats', methods=['GET'])
+def track_search_stats():
+    return jsonify({'success': True, 'events': search_events.stats()})
+
+# NDJSON export of a whole result set. The query runs on an unbuffered
+# cursor and rows are pulled with fetchmany while the response is being
+# written, so the pooled connection stays checked out until the response
+# is closed.
+def stream_ndjson(sql, params):
+    resources = ExitStack()
+    try:
+        conn, cursor = resources.enter_context(db_cursor())
+        cursor.execute(sql, params)
+    except BaseException:
+        resources.close()
+        raise
+    
+    response = Response(iter_ndjson(cursor, current_app.json.dumps), mimetype='application/x-ndjson')
+    response.call_on_close(resources.close)
+    return response
+
+# Search analytics, served from the daily rollup tables. Each request
+# first folds in new raw events, at most once per ROLLUP_REFRESH_SECONDS
+# per process; `python analytics.py` does the same from cron. A failed
+# refresh is logged and retried after the same interval, and until one
+# succeeds the existing rollups are served marked `stale`.
+ROLLUP_REFRESH_SECONDS = float(os.environ.get('ROLLUP_REFRESH_SECONDS', 30))
+rollup_refresh_lock = threading.Lock()
+last_rollup_refresh = 0.0
+rollups_stale = False
+
+def maybe_refresh_rollups():
+    global last_rollup_refresh, rollups_stale
+    if time.monotonic() - last_rollup_refresh < ROLLUP_REFRESH_SECONDS:
+        return
+    if not rollup_refresh_lock.acquire(blocking=False):
+        return
+    try:
+        searches.refresh_rollups()
+        rollups_stale = False
+    except DATABASE_ERRORS as e:
+        logger.warning('Search rollup refresh failed, serving existing rollups: %s', e)
+        rollups_stale = True
     finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
+        last_rollup_refresh = time.monotonic()
+        rollup_refresh_lock.release()
+
+@api.route('/api/analytics/searches', methods=['GET'])
+def search_analytics():
+    group_by = request.args.get('group_by', 'platform')
+    if group_by not in GROUPINGS:
+        return jsonify({'success': False, 'message': f"group_by must be one of {', '.join(GROUPINGS)}"}), 400
+    try:
+        days = max(1, min(int(request.args.get('days', 30)), MAX_DAYS))
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'days and limit must be integers'}), 400
+    
+    try:
+        maybe_refresh_rollups()
+        results = searches.counts(group_by, days, request.args.get('platform'), limit)
+        return jsonify({'success': True, 'group_by': group_by, 'days': days, 'results': results,
+                        'stale': rollups_stale})
+    except DATABASE_ERRORS as e:
+        logger.error('Database error: %s', e)
+        return jsonify({'success': False, 'message': str(e)}), 500
 
 # Get all users
-@app.route('/api/users', methods=['GET'])
+@api.route('/api/users', methods=['GET'])
 def get_users():
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-    cursor = None
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute('SELECT id, name, email, phone, skills, created_at FROM users')
-        users = cursor.fetchall()
-        return jsonify({'success': True, 'users': users})
-    except Error as e:
+        columns = select_list(request.args.get('fields'), USER_FIELDS, USER_KEY)
+        after = decode_keyset(request.args.get('cursor'), (int,))
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    sql, params = users.list_query(columns, after[0] if after else None)
+    
+    try:
+        if request.args.get('format') == 'ndjson':
+            return stream_ndjson(sql, params)
+        
+        with db_cursor() as (conn, cursor):
+            cursor.execute(sql + ' LIMIT %s', params + [limit + 1])
+            page, next_cursor = paginate(cursor.fetchall(), limit, USER_KEY)
+        return jsonify({'success': True, 'users': page, 'next_cursor': next_cursor})
+    except DATABASE_ERRORS as e:
         return jsonify({'success': False, 'message': str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn and conn.is_connected():
-            conn.close()
 
-# Serve the frontend
-@app.route('/')
+# Serve the frontend from the in-memory asset set. Only files under
+# STATIC_DIR are reachable; the backend's own directory is never served.
+@api.route('/')
 def serve_frontend():
-    return send_from_directory('.', 'Project.html')
+    return serve_static(None)
 
-@app.route('/<path:path>')
+@api.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory('.', path)
+    response = static_assets.serve(path, request)
+    if response is None:
+        abort(404)
+    return response
 
-# Health check endpoint
-@app.route('/health')
+# Liveness: the process is up and serving requests. Never touches the
+# database, so a database outage doesn't get healthy workers restarted.
+@api.route('/health')
+@api.route('/health/live')
 def health_check():
     return jsonify({'status': 'healthy', 'message': 'InternConnect API is running'})
 
+# Readiness: a pooled SELECT 1 with a short checkout timeout. The outcome
+# is cached for a few seconds so load balancer probes from every node
+# cost one query per worker per interval, not one per probe.
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', 1))
+readiness_cache = Cache('readiness', maxsize=1, ttl=float(os.environ.get('READINESS_CACHE_SECONDS', 5)))
+readiness_lock = threading.Lock()
+
+def check_database_ready():
+    started = time.monotonic()
+    try:
+        with db_cursor(dictionary=False, timeout=READINESS_TIMEOUT) as (conn, cursor):
+            cursor.execute('SELECT 1')
+            cursor.fetchall()
+        return {'ready': True, 'latency_ms': round((time.monotonic() - started) * 1000, 1)}
+    except DATABASE_ERRORS as e:
+        return {'ready': False, 'error': str(e)}
+
+@api.route('/health/ready')
+def readiness_check():
+    result = readiness_cache.get('database')
+    if result is MISSING:
+        with readiness_lock:
+            result = readiness_cache.get('database')
+            if result is MISSING:
+                result = check_database_ready()
+                result['checked_at'] = datetime.utcnow().isoformat() + 'Z'
+                readiness_cache.set('database', result)
+    
+    status = 200 if result['ready'] else 503
+    return jsonify({'status': 'ready' if result['ready'] else 'unavailable', 'database': result}), status
+
+# Flushes buffered search events and stops the worker pools. Runs at
+# interpreter exit, and from gunicorn's worker_exit hook once in-flight
+# requests have drained (see gunicorn.conf.py).
+shutdown_lock = threading.Lock()
+
+def shutdown():
+    with shutdown_lock:
+        search_events.close()
+        resume_jobs.shutdown(wait=False)
+        password_hasher.shutdown()
+        storage.close()
+
+atexit.register(shutdown)
+
+# App factory. Shared resources (storage, caches, pools) are per process,
+# so every app built here shares them. The serving entry point is
+# `gunicorn -c gunicorn.conf.py`, which loads the module's `app` below,
+# so each worker builds exactly one.
+def create_app():
+    app = Flask(__name__)
+    CORS(app)
+    app.register_blueprint(api)
+    return app
+
+app = create_app()
+
+# Process pool workers re-import this file as __mp_main__ when it is run
+# directly (see process_pools.py): keep module-level work lazy, and
+# anything that should happen once below this guard
 if __name__ == '__main__':
-    print("🚀 Starting Flask app with MySQL...")
+    # Development server only. It applies pending migrations itself;
+    # under gunicorn the master does that once per start
+    try:
+        migrate(storage)
+    except DATABASE_ERRORS as e:
+        logger.error('Database migration error: %s', e)
+    logger.info('Starting Flask app with %s storage', storage.dialect)
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
@@ -0,0 +1,521 @@
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import zipfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+from config import DB_CONFIG
+from storage import DEFAULT_SQLITE_PATH
+
+# Load test for the API. Seeds a synthetic dataset into a separate MySQL
+# database (--database, default IC1_bench), then drives each endpoint at the
+# requested concurrency levels either in-process through the WSGI app or
+# over HTTP against a running server (--url), and reports latency
+# percentiles and throughput. Results are written as JSON so runs can be
+# compared with --compare.
+#
+#   python benchmark.py --users 2000 --internships 5000 --concurrency 1,8,32
+#   python benchmark.py --scenarios login,resume-pdf --compare last.json
+
+BENCH_DATABASE = 'IC1_bench'
+BENCH_PASSWORD = 'benchmark-password'
+SKILL_POOL = [
+    'Python', 'JavaScript', 'React', 'SQL', 'Java', 'C++', 'Node.js', 'Machine Learning', 'Pandas', 'Docker',
+    'AWS', 'Figma', 'HTML', 'CSS', 'Linux', 'Git', 'TypeScript', 'Django', 'Flask', 'MongoDB', 'Excel',
+    'Tableau', 'Kubernetes', 'Go', 'Rust', 'Data Analysis', 'Network Security', 'Digital Marketing'
+]
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Boston, MA', 'Chicago, IL', 'Remote']
+TYPES = ['Remote', 'Hybrid', 'On-site']
+PLATFORMS = ['LinkedIn', 'Indeed', 'Internshala', 'Glassdoor']
+# The internships-poll scenario cycles over this many users, so most polls
+# revalidate a view that was fetched before
+POLLING_USERS = 50
+RESUME_BATCH_SIZE = 20
+RESUME_SECTIONS = ['Experience', 'Education', 'Skills', 'Projects', 'Certifications', 'Summary']
+FILLER = ('Built and shipped features with a small team, wrote tests, reviewed code and documented the '
+          'design decisions behind each change.')
+
+
+# --- Synthetic documents ------------------------------------------------------
+
+def resume_paragraphs(rng, pages=2):
+    paragraphs = [f'Candidate {uuid.uuid4().hex[:8]}']
+    for _ in range(pages):
+        for section in rng.sample(RESUME_SECTIONS, 4):
+            paragraphs.append(section)
+            skills = ', '.join(rng.sample(SKILL_POOL, 6))
+            paragraphs.append(f'{FILLER} Worked with {skills}. ' * rng.randint(2, 6))
+    return paragraphs
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+# Minimal multi-page PDF with one text stream per page, enough for PyPDF2
+def make_pdf(paragraphs, lines_per_page=40, width=90):
+    lines = []
+    for paragraph in paragraphs:
+        while paragraph:
+            lines.append(paragraph[:width])
+            paragraph = paragraph[width:]
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = []
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects.append(b'<< /Type /Catalog /Pages 2 0 R >>')
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] "
+                   f'/Count {len(pages)} >>'.encode())
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    for page_id, page_lines in zip(page_ids, pages):
+        text = 'BT /F1 10 Tf 12 TL 40 760 Td ' + ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in page_lines) + ' ET'
+        stream = text.encode('latin-1', 'replace')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>'.encode())
+        objects.append(b'<< /Length ' + str(len(stream)).encode() + b' >>\nstream\n' + stream + b'\nendstream')
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f'{number} 0 obj\n'.encode() + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode())
+    for offset in offsets:
+        out.write(f'{offset:010d} 00000 n \n'.encode())
+    out.write(f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+    return out.getvalue()
+
+
+def make_docx(paragraphs):
+    import docx
+
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_txt(paragraphs):
+    return '\n'.join(paragraphs).encode('utf-8')
+
+
+RESUME_MAKERS = {'pdf': make_pdf, 'docx': make_docx, 'txt': make_txt}
+
+
+# --- Dataset ----------------------------------------------------------------
+
+def _insert_rows(cursor, sql, rows, width, batch_size):
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        placeholders = ', '.join(['(' + ', '.join(['%s'] * width) + ')'] * len(batch))
+        cursor.execute(sql.format(rows=placeholders), [value for row in batch for value in row])
+
+
+# Adds `users` users, `internships` postings, `applications` applications
+# and `searches` search events on top of whatever is already there
+def seed_dataset(conn, rng, users, internships, applications, searches, batch_size=1000):
+    from werkzeug.security import generate_password_hash
+
+    from ingest import import_internships
+    from skill_index import backfill_skill_index
+
+    run = uuid.uuid4().hex[:8]
+    records = (
+        (index, {
+            'title': f'{rng.choice(SKILL_POOL)} Intern {run}-{index}',
+            'company': f'Company {index % 500}',
+            'location': rng.choice(LOCATIONS),
+            'type': rng.choice(TYPES),
+            'duration': f'{rng.randint(2, 6)} months',
+            'stipend': f'${rng.randint(10, 50) * 100}/month',
+            'description': FILLER,
+            'skills_required': rng.sample(SKILL_POOL, rng.randint(2, 6))
+        })
+        for index in range(internships)
+    )
+    import_internships(conn, records, batch_size)
+
+    # One shared hash keeps seeding fast; every bench user has the same password
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+    cursor = conn.cursor()
+    user_rows = [
+        (f'Bench User {index}', '555-0100', f'bench-{run}-{index}@example.com',
+         ','.join(rng.sample(SKILL_POOL, rng.randint(2, 6))), password_hash)
+        for index in range(users)
+    ]
+    _insert_rows(cursor, 'INSERT INTO users (name, phone, email, skills, password_hash) VALUES {rows}',
+                 user_rows, 5, batch_size)
+    conn.commit()
+    backfill_skill_index(cursor)
+    conn.commit()
+
+    user_ids, internship_ids = load_ids(cursor)
+    if user_ids and internship_ids:
+        now = datetime.now()
+        application_rows = [(rng.choice(user_ids), rng.choice(internship_ids)) for _ in range(applications)]
+        _insert_rows(cursor, 'INSERT IGNORE INTO applications (user_id, internship_id) VALUES {rows}',
+                     application_rows, 2, batch_size)
+        search_rows = [
+            (rng.choice(user_ids), rng.choice(PLATFORMS), ','.join(rng.sample(SKILL_POOL, 3)),
+             now - timedelta(seconds=rng.randint(60, 30 * 86400)))
+            for _ in range(searches)
+        ]
+        _insert_rows(cursor, 'INSERT INTO search_tracking (user_id, platform, skills, search_date) VALUES {rows}',
+                     search_rows, 4, batch_size)
+        conn.commit()
+    cursor.close()
+
+
+def load_ids(cursor):
+    cursor.execute('SELECT id FROM users')
+    user_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute('SELECT id FROM internships')
+    internship_ids = [row[0] for row in cursor.fetchall()]
+    return user_ids, internship_ids
+
+
+def load_bench_users(cursor, limit=5000):
+    cursor.execute("SELECT id, email FROM users WHERE email LIKE 'bench-%%' LIMIT %s", (limit,))
+    return cursor.fetchall()
+
+
+# --- Scenarios ----------------------------------------------------------------
+
+# Each scenario builds one request: (method, path, options), where options
+# may hold `json` or a `file` of (filename, bytes)
+def _resume_scenario(kind):
+    def build(ctx, rng):
+        if ctx.reuse_resumes:
+            filename, data = rng.choice(ctx.resume_pool[kind])
+        else:
+            filename, data = f'resume.{kind}', RESUME_MAKERS[kind](resume_paragraphs(rng, ctx.resume_pages))
+        return 'POST', '/api/analyze-resume', {'file': (filename, data)}
+    return build
+
+
+# A ZIP of RESUME_BATCH_SIZE fresh resumes of mixed formats
+def _resume_batch_scenario(ctx, rng):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index in range(RESUME_BATCH_SIZE):
+            kind = rng.choice(sorted(RESUME_MAKERS))
+            archive.writestr(f'resume-{index}.{kind}', RESUME_MAKERS[kind](resume_paragraphs(rng, ctx.resume_pages)))
+    return 'POST', '/api/analyze-resume/batch', {'file': ('batch.zip', buffer.getvalue())}
+
+
+SCENARIOS = {
+    'health': lambda ctx, rng: ('GET', '/health', {}),
+    'ready': lambda ctx, rng: ('GET', '/health/ready', {}),
+    'internships': lambda ctx, rng: (
+        'GET', f"/api/internships?user_id={rng.choice(ctx.user_ids)}&filter={rng.choice(['All'] + TYPES)}", {}),
+    'recommend': lambda ctx, rng: (
+        'GET', f'/api/internships?mode=recommend&user_id={rng.choice(ctx.user_ids)}', {}),
+    'search': lambda ctx, rng: ('GET', '/api/internships/search?' + urllib.parse.urlencode(
+        {'q': ' '.join(rng.sample(SKILL_POOL, 2)), 'type': rng.choice(['', ''] + TYPES)}), {}),
+    'external': lambda ctx, rng: ('GET', f'/api/external-internships?user_id={rng.choice(ctx.user_ids)}', {}),
+    # Clients re-polling an unchanged view with the ETag they were last sent
+    'internships-poll': lambda ctx, rng: (
+        'GET', f"/api/internships?user_id={rng.choice(ctx.user_ids[:POLLING_USERS])}&filter=All",
+        {'etags': ctx.etags}),
+    'apply': lambda ctx, rng: ('POST', '/api/apply', {'json': {
+        'user_id': rng.choice(ctx.user_ids), 'internship_id': rng.choice(ctx.internship_ids)}}),
+    'apply-batch': lambda ctx, rng: ('POST', '/api/applications/batch', {'json': {
+        'user_id': rng.choice(ctx.user_ids),
+        'internship_ids': rng.sample(ctx.internship_ids, min(10, len(ctx.internship_ids)))}}),
+    'applications': lambda ctx, rng: ('GET', f'/api/applications?user_id={rng.choice(ctx.user_ids)}', {}),
+    'users': lambda ctx, rng: ('GET', '/api/users?limit=50', {}),
+    'login': lambda ctx, rng: ('POST', '/api/login', {'json': {
+        'email': rng.choice(ctx.bench_emails), 'password': BENCH_PASSWORD}}),
+    'track-search': lambda ctx, rng: ('POST', '/api/track-search', {'json': {
+        'user_id': rng.choice(ctx.user_ids), 'platform': rng.choice(PLATFORMS),
+        'skills': rng.sample(SKILL_POOL, 3)}}),
+    'analytics': lambda ctx, rng: (
+        'GET', f"/api/analytics/searches?group_by={rng.choice(['platform', 'skill', 'day'])}", {}),
+    'chat': lambda ctx, rng: ('POST', '/api/chat', {'json': {'message': 'any internship tips?'}}),
+    'resume-pdf': _resume_scenario('pdf'),
+    'resume-docx': _resume_scenario('docx'),
+    'resume-txt': _resume_scenario('txt'),
+    'resume-batch': _resume_batch_scenario,
+}
+
+
+class Context:
+    def __init__(self, user_ids, internship_ids, bench_emails, reuse_resumes, resume_pages, rng):
+        self.user_ids = user_ids or [0]
+        self.internship_ids = internship_ids or [0]
+        self.bench_emails = bench_emails or ['nobody@example.com']
+        self.reuse_resumes = reuse_resumes
+        self.resume_pages = resume_pages
+        self.resume_pool = {}
+        self.etags = {}
+        if reuse_resumes:
+            for kind, make in RESUME_MAKERS.items():
+                self.resume_pool[kind] = [(f'resume.{kind}', make(resume_paragraphs(rng, resume_pages)))
+                                          for _ in range(10)]
+
+
+# --- Transports ---------------------------------------------------------------
+
+class InProcessTransport:
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method, path, options):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        kwargs = {}
+        etags = options.get('etags')
+        if etags is not None and path in etags:
+            kwargs['headers'] = {'If-None-Match': etags[path]}
+        if 'json' in options:
+            kwargs['json'] = options['json']
+        if 'file' in options:
+            filename, data = options['file']
+            kwargs['data'] = {'file': (io.BytesIO(data), filename)}
+            kwargs['content_type'] = 'multipart/form-data'
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()
+        if etags is not None and 'ETag' in response.headers:
+            etags[path] = response.headers['ETag']
+        status = response.status_code
+        response.close()
+        return status
+
+
+class HttpTransport:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, options):
+        headers = {}
+        body = None
+        etags = options.get('etags')
+        if etags is not None and path in etags:
+            headers['If-None-Match'] = etags[path]
+        if 'json' in options:
+            body = json.dumps(options['json']).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        if 'file' in options:
+            boundary = uuid.uuid4().hex
+            filename, data = options['file']
+            body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                    f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as e:
+            e.read()
+            status, response_headers = e.code, e.headers
+        if etags is not None and response_headers.get('ETag'):
+            etags[path] = response_headers['ETag']
+        return status
+
+
+# --- Runner -------------------------------------------------------------------
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(transport, build, ctx, concurrency, requests, duration, seed):
+    latencies = []
+    statuses = Counter()
+    errors = [0]
+    lock = threading.Lock()
+    remaining = [requests]
+    deadline = time.monotonic() + duration if duration else None
+
+    def take():
+        with lock:
+            if deadline is not None:
+                return time.monotonic() < deadline
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(worker_seed):
+        rng = random.Random(worker_seed)
+        while take():
+            method, path, options = build(ctx, rng)
+            started = time.perf_counter()
+            try:
+                status = transport.send(method, path, options)
+            except Exception:
+                status = 'error'
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[str(status)] += 1
+                if status == 'error' or status >= 500:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(seed + index,), daemon=True) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    to_ms = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'statuses': dict(sorted(statuses.items())),
+        'seconds': round(wall, 3),
+        'rps': round(len(latencies) / wall, 1) if wall else 0.0,
+        'mean_ms': to_ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50_ms': to_ms(percentile(latencies, 0.50)),
+        'p95_ms': to_ms(percentile(latencies, 0.95)),
+        'p99_ms': to_ms(percentile(latencies, 0.99)),
+        'max_ms': to_ms(latencies[-1]) if latencies else None
+    }
+
+
+def print_results(results, baseline=None):
+    previous = {(row['scenario'], row['concurrency']): row for row in (baseline or {}).get('results', [])}
+    print(f"{'scenario':<14}{'conc':>5}{'reqs':>7}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for row in results:
+        line = (f"{row['scenario']:<14}{row['concurrency']:>5}{row['requests']:>7}{row['errors']:>5}"
+                f"{row['rps']:>9}{row['p50_ms'] or 0:>9}{row['p95_ms'] or 0:>9}{row['p99_ms'] or 0:>9}")
+        old = previous.get((row['scenario'], row['concurrency']))
+        if old and old.get('rps') and old.get('p95_ms'):
+            line += (f"   rps {100 * (row['rps'] / old['rps'] - 1):+.0f}%"
+                     f"  p95 {100 * ((row['p95_ms'] or 0) / old['p95_ms'] - 1):+.0f}%")
+        print(line)
+
+
+# Why seeding `database` would write into real data, or None
+def seed_target_problem(database):
+    if os.environ.get('DB_ENGINE', 'mysql').lower() == 'sqlite':
+        path = os.environ.get('SQLITE_PATH', DEFAULT_SQLITE_PATH)
+        if os.path.abspath(path) == os.path.abspath(DEFAULT_SQLITE_PATH):
+            return f'SQLITE_PATH points at the bundled {os.path.basename(DEFAULT_SQLITE_PATH)}, not a scratch file'
+        return None
+    if database == DB_CONFIG['database']:
+        return f'{database} is the app database configured by DB_NAME'
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Seed a benchmark database and load test the API')
+    # Deliberately not DB_NAME: deployers export that for the real database
+    parser.add_argument('--database', default=BENCH_DATABASE,
+                        help=f'MySQL database to seed and run against (default: {BENCH_DATABASE})')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--internships', type=int, default=2000)
+    parser.add_argument('--applications', type=int, default=5000)
+    parser.add_argument('--searches', type=int, default=20000)
+    parser.add_argument('--skip-seed', action='store_true', help='reuse the data already in the database')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated scenario names')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario and concurrency level')
+    parser.add_argument('--duration', type=float, help='run each level for this many seconds instead')
+    parser.add_argument('--url', help='benchmark a running server instead of the in-process app')
+    parser.add_argument('--resume-pages', type=int, default=2)
+    parser.add_argument('--reuse-resumes', action='store_true',
+                        help='upload from a fixed pool of documents, exercising the result cache')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='results file (default: benchmark-<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    # Seeding writes thousands of synthetic rows, so never into the database
+    # the app is configured for
+    if not args.skip_seed:
+        problem = seed_target_problem(args.database)
+        if problem:
+            parser.error(f'{problem}; pass --skip-seed to benchmark it without seeding')
+
+    # The app builds its storage from DB_CONFIG at import, so point it at
+    # the benchmark database before importing
+    os.environ['DB_NAME'] = DB_CONFIG['database'] = args.database
+    import app as app_module
+    from migrations import migrate
+
+    migrate(app_module.storage)
+    rng = random.Random(args.seed)
+    conn = app_module.storage.connect()
+    try:
+        if not args.skip_seed:
+            started = time.perf_counter()
+            seed_dataset(conn, rng, args.users, args.internships, args.applications, args.searches)
+            print(f"🌱 Seeded dataset in {time.perf_counter() - started:.1f}s")
+        cursor = conn.cursor()
+        user_ids, internship_ids = load_ids(cursor)
+        bench_emails = [email for _, email in load_bench_users(cursor)]
+        cursor.close()
+    finally:
+        conn.close()
+
+    ctx = Context(user_ids, internship_ids, bench_emails, args.reuse_resumes, args.resume_pages, rng)
+    transport = HttpTransport(args.url) if args.url else InProcessTransport(app_module.app)
+
+    results = []
+    for name in scenarios:
+        for level in levels:
+            # Warm caches and pools so the first level isn't measuring startup
+            run_scenario(transport, SCENARIOS[name], ctx, level, level, None, args.seed)
+            row = run_scenario(transport, SCENARIOS[name], ctx, level, args.requests, args.duration, args.seed)
+            row['scenario'] = name
+            results.append(row)
+            print(f"  {name} @ {level}: {row['rps']} req/s, p95 {row['p95_ms']} ms")
+
+    report = {
+        'started_at': datetime.utcnow().isoformat() + 'Z',
+        'target': args.url or 'in-process',
+        'database': args.database,
+        'dataset': {'users': len(user_ids), 'internships': len(internship_ids)},
+        'options': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'python': sys.version.split()[0],
+        'results': results
+    }
+    output = args.output or f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print()
+    print_results(results, baseline)
+    print(f"\n📄 Results written to {output}")
+
+    app_module.resume_jobs.shutdown(wait=False)
+    app_module.search_events.close()
+
+
+if __name__ == '__main__':
+    main()
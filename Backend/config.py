@@ -0,0 +1,19 @@
+import os
+
+# Settings shared by the app, the CLIs and the gunicorn master (which
+# runs migrations without importing the app). Everything else the app
+# tunes is read where it is used.
+
+# MySQL database configuration; DB_* variables override the local XAMPP setup
+DB_CONFIG = {
+    'host': os.environ.get('DB_HOST', 'localhost'),
+    'port': int(os.environ.get('DB_PORT', 3306)),
+    'user': os.environ.get('DB_USER', 'root'),
+    'password': os.environ.get('DB_PASSWORD', 'Kal78048'),  # Password for XAMPP
+    'database': os.environ.get('DB_NAME', 'IC1')
+}
+
+# The pure-Python driver does its I/O through the socket module, so
+# under gevent's monkey patching it yields instead of blocking the worker
+if os.environ.get('DB_USE_PURE', '').lower() in ('1', 'true', 'yes'):
+    DB_CONFIG['use_pure'] = True
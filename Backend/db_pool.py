@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector import Error
+
+
+class PoolTimeoutError(Error):
+    pass
+
+
+# Bounded pool of MySQL connections shared by every request thread.
+# Connections are opened lazily, so importing the app never touches MySQL.
+class ConnectionPool:
+    def __init__(self, config, size=10, timeout=5.0, ping_interval=30.0):
+        self.config = dict(config)
+        self.size = max(1, int(size))
+        self.timeout = float(timeout)
+        self.ping_interval = float(ping_interval)
+
+        self._idle = deque()  # (conn, last_used) pairs, most recently used on the right
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        conn, last_used = None, None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                # Idle is empty, so every open connection is checked out
+                if self._in_use < self.size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(msg=f'No database connection available after {timeout:.1f}s')
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+
+        # Health check and connect happen outside the lock so slow
+        # handshakes don't block other threads returning connections
+        try:
+            if conn is not None and time.monotonic() - last_used >= self.ping_interval:
+                if not self._is_alive(conn):
+                    self._close(conn)
+                    conn = None
+            if conn is None:
+                conn = mysql.connector.connect(**self.config)
+                with self._cond:
+                    self._created += 1
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return conn
+
+    def release(self, conn):
+        healthy = True
+        try:
+            # End whatever transaction the request left open so the next
+            # borrower doesn't inherit its locks or its read snapshot
+            conn.rollback()
+        except Error:
+            healthy = False
+
+        if not healthy:
+            self._close(conn)
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'created': self._created,
+                'discarded': self._discarded,
+                'timeouts': self._timeouts
+            }
+
+    def _is_alive(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def _close(self, conn):
+        with self._cond:
+            self._discarded += 1
+        try:
+            conn.close()
+        except Error:
+            pass
+
@@ -0,0 +1,152 @@
+import logging
+import queue
+import threading
+import time
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+# Write-behind buffer for high-volume events. Producers enqueue and return
+# immediately; one background thread drains the queue and hands batches
+# to write_batch(events) every `batch_size` events or `flush_interval`
+# seconds, whichever comes first. write_batch may return how many events
+# it actually wrote; the rest are counted as dropped. When the buffer is
+# full, put() waits up to `put_timeout` seconds for room and then drops
+# the event.
+class BufferedEventSink:
+    def __init__(self, write_batch, batch_size=100, flush_interval=0.5, capacity=10000,
+                 put_timeout=0.05, retries=1, name='event-sink'):
+        self.write_batch = write_batch
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.put_timeout = float(put_timeout)
+        self.retries = int(retries)
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=max(1, int(capacity)))
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._stop = threading.Event()
+        self._counts_lock = threading.Lock()
+        self._queued = 0
+        self._flushed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._failed_batches = 0
+
+    def put(self, event):
+        if self._closed:
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put(event, timeout=self.put_timeout)
+        except queue.Full:
+            self._count('_dropped')
+            return False
+        self._count('_queued')
+        return True
+
+    # Stops the flusher after writing everything already queued. Never
+    # blocks on a full buffer: the stop event ends the flusher once it has
+    # drained, and the _STOP marker only wakes it when it is idle.
+    def close(self, timeout=10.0):
+        with self._start_lock:
+            self._closed = True
+            thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning('%s: flusher still running after %.1fs, abandoning about %d queued events',
+                           self.name, timeout, self._queue.qsize())
+        elif self._dropped:
+            logger.warning('%s: dropped %d events in total', self.name, self._dropped)
+
+    def stats(self):
+        with self._counts_lock:
+            return {
+                'queued': self._queued,
+                'flushed': self._flushed,
+                'dropped': self._dropped,
+                'pending': self._queue.qsize(),
+                'batches': self._batches,
+                'failed_batches': self._failed_batches
+            }
+
+    def _ensure_started(self):
+        # Started lazily so pre-forking servers don't fork a running thread
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            # The stop event covers a close() that found the buffer too full
+            # for the _STOP marker
+            if stopping or self._stop.is_set():
+                stopping = True
+                # Drain whatever was queued before close()
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                batch = [event for event in batch if event is not _STOP]
+
+            for start in range(0, len(batch), self.batch_size):
+                self._flush(batch[start:start + self.batch_size])
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        for attempt in range(self.retries + 1):
+            try:
+                written = self.write_batch(batch)
+            except Exception as e:
+                if attempt < self.retries:
+                    time.sleep(min(0.1 * 2 ** attempt, 1.0))
+                    continue
+                logger.warning('%s: dropping %d events after write failure: %s', self.name, len(batch), e)
+                with self._counts_lock:
+                    self._failed_batches += 1
+                    self._dropped += len(batch)
+                return
+            written = len(batch) if written is None else written
+            with self._counts_lock:
+                self._batches += 1
+                self._flushed += written
+                self._dropped += len(batch) - written
+            return
+
+    def _count(self, name):
+        with self._counts_lock:
+            setattr(self, name, getattr(self, name) + 1)
@@ -0,0 +1,87 @@
+import logging
+import multiprocessing
+import os
+
+# Production server settings: `gunicorn -c Backend/gunicorn.conf.py`.
+# Every value can be overridden from the environment.
+#
+# GUNICORN_WORKER_CLASS=gthread (default): WEB_CONCURRENCY processes with
+# GUNICORN_THREADS threads each. Threads overlap blocking database I/O;
+# password hashing and resume parsing run on per-worker process pools,
+# so they don't hold a worker's GIL.
+#
+# GUNICORN_WORKER_CLASS=gevent: up to GUNICORN_WORKER_CONNECTIONS
+# greenlets per worker, for many slow, mostly idle connections. Needs
+# `pip install gevent` and MySQL, whose pure-Python driver is cooperative
+# once gevent patches sockets. SQLite calls block the whole worker.
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+# The module-level app; 'app:create_app()' would build a second one per
+# worker on top of it
+wsgi_app = 'app:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# A request is killed after `timeout` seconds of silence from its worker.
+# Synchronous resume parsing is the slowest path, so keep this above
+# RESUME_JOB_TIMEOUT.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+# On SIGTERM workers stop accepting and get this long to finish in-flight
+# requests before worker_exit flushes buffers and they exit
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Recycle workers after this many requests (0 = never)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+# Workers import the app themselves: connection pools, process pools and
+# background threads must not be created before the fork
+preload_app = False
+
+# Each worker sizes its own pools. Defaults split the CPUs between
+# workers instead of giving every worker one process per CPU, and give
+# each gthread worker a connection per thread.
+_cpus = multiprocessing.cpu_count()
+os.environ.setdefault('PASSWORD_HASH_WORKERS', str(max(1, _cpus // workers)))
+os.environ.setdefault('RESUME_WORKERS', str(max(1, _cpus // workers)))
+if worker_class == 'gevent':
+    os.environ.setdefault('DB_USE_PURE', '1')
+else:
+    os.environ.setdefault('DB_POOL_SIZE', str(threads))
+
+
+# Master process, once per start: apply pending migrations before any
+# worker serves traffic. Set MIGRATE_ON_START=0 to run them separately.
+def on_starting(server):
+    from logging_config import configure_logging
+
+    configure_logging()
+    if os.environ.get('MIGRATE_ON_START', '1') != '1':
+        return
+
+    from config import DB_CONFIG
+    from migrations import migrate
+    from storage import DATABASE_ERRORS, create_storage
+
+    try:
+        migrate(create_storage(DB_CONFIG))
+    except DATABASE_ERRORS as e:
+        logging.getLogger('internconnect').error('Database migration error: %s', e)
+
+
+def when_ready(server):
+    logger = logging.getLogger('internconnect')
+    logger.info('Serving with %s workers (%s)', workers, worker_class)
+    if worker_class == 'gevent' and os.environ.get('DB_ENGINE', 'mysql').lower() == 'sqlite':
+        logger.warning('SQLite calls are not cooperative under gevent; use gthread workers with DB_ENGINE=sqlite')
+
+
+# Worker process, after in-flight requests have drained
+def worker_exit(server, worker):
+    import app
+
+    app.shutdown()
@@ -0,0 +1,214 @@
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+
+from config import DB_CONFIG
+from skill_index import reindex_internships
+from storage import create_storage
+
+INTERNSHIP_FIELDS = ['title', 'company', 'location', 'type', 'duration', 'stipend', 'description', 'skills_required']
+# What the API returns for an internship: bookkeeping columns such as
+# catalog_version stay out of the payloads
+INTERNSHIP_COLUMNS = ['id'] + INTERNSHIP_FIELDS + ['created_at']
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 50
+
+# (title, company) is unique, so re-importing a feed updates postings in place
+UPSERT_SQL = '''
+    INSERT INTO internships
+    (title, company, location, type, duration, stipend, description, skills_required{version_column})
+    VALUES {rows}
+    ON DUPLICATE KEY UPDATE
+        location = VALUES(location),
+        type = VALUES(type),
+        duration = VALUES(duration),
+        stipend = VALUES(stipend),
+        description = VALUES(description),
+        skills_required = VALUES(skills_required){version_update}
+'''
+
+# Bumped in the same transaction as every batch, so readers can tell the
+# catalog changed without scanning it (see InternshipRepository.view_version).
+# Written rows are stamped with the new version in catalog_version, so
+# readers can also fetch just what changed since a version they've seen.
+BUMP_CATALOG_VERSION_SQL = "UPDATE data_versions SET version = version + 1 WHERE name = 'internships'"
+CATALOG_VERSION_SQL = "SELECT version FROM data_versions WHERE name = 'internships'"
+
+
+class InvalidRecord(ValueError):
+    pass
+
+
+def detect_format(filename=None, content_type=None):
+    name = (filename or '').lower()
+    if name.endswith('.csv') or 'csv' in (content_type or ''):
+        return 'csv'
+    return 'jsonl'
+
+
+# Yields (line_number, record) pairs; record is None for lines that
+# aren't valid JSON so one bad line doesn't abort the import
+def iter_records(stream, fmt):
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def normalize_record(record):
+    if not isinstance(record, dict):
+        raise InvalidRecord('Not a JSON object')
+
+    skills = record.get('skills_required', record.get('skills'))
+    if isinstance(skills, (list, tuple)):
+        skills = ','.join(str(skill).strip() for skill in skills if str(skill).strip())
+
+    row = {field: str(record.get(field) or '').strip() for field in INTERNSHIP_FIELDS}
+    row['skills_required'] = (skills or '').strip()
+
+    missing = [field for field in INTERNSHIP_FIELDS if not row[field]]
+    if missing:
+        raise InvalidRecord(f"Missing {', '.join(missing)}")
+    if len(row['title']) > 255 or len(row['company']) > 255:
+        raise InvalidRecord('title and company must be at most 255 characters')
+    return tuple(row[field] for field in INTERNSHIP_FIELDS)
+
+
+# Upserts records in batches of multi-row INSERTs, one transaction per
+# batch, and keeps the skill index and catalog version in step.
+# on_progress(stats) is called after every committed batch. Only the
+# sample-data migration, which runs before data_versions exists, passes
+# bump_version=False.
+def import_internships(conn, records, batch_size=DEFAULT_BATCH_SIZE, on_progress=None, bump_version=True):
+    batch_size = max(1, int(batch_size))
+    started = time.monotonic()
+    stats = {'processed': 0, 'written': 0, 'invalid': 0, 'batches': 0, 'errors': []}
+
+    def report():
+        elapsed = time.monotonic() - started
+        stats['elapsed_seconds'] = round(elapsed, 3)
+        stats['rows_per_second'] = round(stats['written'] / elapsed, 1) if elapsed else 0.0
+
+    cursor = conn.cursor()
+    batch = []
+    try:
+        for line_number, record in records:
+            stats['processed'] += 1
+            try:
+                batch.append(normalize_record(record))
+            except InvalidRecord as e:
+                stats['invalid'] += 1
+                if len(stats['errors']) < MAX_REPORTED_ERRORS:
+                    stats['errors'].append({'line': line_number, 'error': str(e) if record is not None else 'Invalid JSON'})
+                continue
+
+            if len(batch) >= batch_size:
+                stats['written'] += _write_batch(conn, cursor, batch, bump_version)
+                stats['batches'] += 1
+                batch = []
+                report()
+                if on_progress:
+                    on_progress(stats)
+
+        if batch:
+            stats['written'] += _write_batch(conn, cursor, batch, bump_version)
+            stats['batches'] += 1
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    report()
+    if on_progress:
+        on_progress(stats)
+    return stats
+
+
+def _write_batch(conn, cursor, batch, bump_version):
+    # Later duplicates in the same batch win, matching ON DUPLICATE KEY
+    unique = {(row[0], row[1]): row for row in batch}
+    rows = list(unique.values())
+
+    version_column = version_update = ''
+    values = rows
+    if bump_version:
+        cursor.execute(BUMP_CATALOG_VERSION_SQL)
+        cursor.execute(CATALOG_VERSION_SQL)
+        version = cursor.fetchone()[0]
+        values = [row + (version,) for row in rows]
+        version_column = ', catalog_version'
+        version_update = ',\n        catalog_version = VALUES(catalog_version)'
+
+    params = [value for row in values for value in row]
+    placeholders = ', '.join(['(' + ', '.join(['%s'] * len(values[0])) + ')'] * len(values))
+    cursor.execute(UPSERT_SQL.format(rows=placeholders, version_column=version_column,
+                                     version_update=version_update), params)
+
+    keys = [value for row in rows for value in row[:2]]
+    placeholders = ', '.join(['(%s, %s)'] * len(rows))
+    cursor.execute(f'SELECT id, title, company FROM internships WHERE (title, company) IN ({placeholders})', keys)
+    # The key comparison is case-insensitive in MySQL, so match the same way
+    ids = {(title.lower(), company.lower()): internship_id for internship_id, title, company in cursor.fetchall()}
+
+    skills_by_id = {}
+    for row in rows:
+        internship_id = ids.get((row[0].lower(), row[1].lower()))
+        if internship_id:
+            skills_by_id[internship_id] = row[7]
+    reindex_internships(cursor, skills_by_id)
+    conn.commit()
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk import internships from CSV or JSONL')
+    parser.add_argument('path', help="input file, or '-' for stdin")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='defaults to the file extension')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    storage = create_storage(DB_CONFIG)
+
+    fmt = args.format or detect_format(args.path)
+    if args.path == '-':
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    else:
+        stream = open(args.path, encoding='utf-8', newline='')
+
+    def progress(stats):
+        print(f"📦 {stats['written']} written, {stats['invalid']} invalid, "
+              f"{stats['rows_per_second']} rows/s")
+
+    conn = storage.connect()
+    try:
+        with stream:
+            stats = import_internships(conn, iter_records(stream, fmt), args.batch_size, progress)
+    finally:
+        conn.close()
+
+    for error in stats['errors']:
+        print(f"⚠️ Line {error['line']}: {error['error']}")
+    print(f"🎉 Imported {stats['written']} internships in {stats['batches']} batches "
+          f"({stats['elapsed_seconds']}s, {stats['rows_per_second']} rows/s)")
+    # Internship views are stamped with the data_versions counter this
+    # import bumped, so workers serve the new rows on their next request
+    print("ℹ️ Internship views reflect the import on the next request (catalog version bumped); "
+          "resume matching picks it up within MATCH_REFRESH_SECONDS")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import re
+
+# Built-in dictionary, used when RESUME_KEYWORDS_FILE is not set. An
+# external file has the same shape: section name -> trigger words, and
+# keyword -> weight (a weight of 1 is worth the original 3 points).
+DEFAULT_KEYWORD_DICTIONARY = {
+    'sections': {
+        'contact_info': ['phone', 'email', 'contact', 'address'],
+        'education': ['education', 'university', 'college', 'degree', 'bachelor', 'master'],
+        'experience': ['experience', 'work', 'employment', 'internship', 'project'],
+        'skills': ['skills', 'technical', 'programming', 'languages', 'tools']
+    },
+    'keywords': {
+        'python': 1, 'javascript': 1, 'java': 1, 'c++': 1, 'react': 1, 'node': 1,
+        'sql': 1, 'html': 1, 'css': 1, 'machine learning': 1, 'data analysis': 1,
+        'web development': 1, 'api': 1, 'git': 1, 'linux': 1
+    }
+}
+
+
+def _normalize_term(term):
+    return ' '.join(term.lower().split())
+
+
+# Builds an alternation factored by shared prefixes ('java', 'javascript'
+# -> java(?:script)?), so each text position costs a walk down one trie
+# branch rather than a try of every term. Spaces match any whitespace run.
+def _trie_pattern(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [
+            (r'\s+' if char == ' ' else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Optional tail is greedy, so the longest term at a position wins
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+# All section triggers and keywords compiled into one alternation, so a
+# resume is scanned once no matter how many terms the dictionary holds.
+class KeywordMatcher:
+    def __init__(self, dictionary):
+        self.sections = list(dictionary.get('sections', {}))
+        self.weights = {
+            _normalize_term(term): float(weight)
+            for term, weight in dictionary.get('keywords', {}).items()
+        }
+        self.keywords = list(self.weights)
+
+        # term -> [('section', name) | ('keyword', term)]
+        self._targets = {}
+        for section, terms in dictionary.get('sections', {}).items():
+            for term in terms:
+                self._targets.setdefault(_normalize_term(term), []).append(('section', section))
+        for term in self.keywords:
+            self._targets.setdefault(term, []).append(('keyword', term))
+
+        # Lookarounds instead of \b so terms like 'c++' still match. The
+        # match sits inside a lookahead so it consumes nothing: every word
+        # start is tried, and a term overlapping the previous match
+        # ('data analysis tools' -> 'analysis tools') is still found.
+        self._pattern = re.compile(r'(?<!\w)(?=(' + _trie_pattern(self._targets) + r')(?!\w))', re.IGNORECASE)
+
+        # Only the longest term at each position matches, so the shorter
+        # terms inside it at word boundaries ('react' in 'react native',
+        # 'learning' in 'machine learning') are recorded alongside it
+        self._nested = {}
+        for term in self._targets:
+            self._nested[term] = [
+                other for other in self._targets
+                if other != term and re.search(r'(?<!\w)' + re.escape(other) + r'(?!\w)', term)
+            ]
+
+        canonical = json.dumps(dictionary, sort_keys=True, separators=(',', ':'))
+        self.version = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+    # Returns (set of sections found, set of keywords found)
+    def scan(self, text):
+        found_sections = set()
+        found_keywords = set()
+        remaining = len(self._targets)
+        if not remaining:
+            return found_sections, found_keywords
+        seen_terms = set()
+
+        for match in self._pattern.finditer(text):
+            term = _normalize_term(match.group(1))
+            if term in seen_terms:
+                continue
+            for found in (term, *self._nested.get(term, ())):
+                if found in seen_terms:
+                    continue
+                seen_terms.add(found)
+                for kind, name in self._targets.get(found, ()):
+                    (found_sections if kind == 'section' else found_keywords).add(name)
+                remaining -= 1
+            if not remaining:
+                break
+
+        return found_sections, found_keywords
+
+
+def load_keyword_dictionary(path=None):
+    path = path or os.environ.get('RESUME_KEYWORDS_FILE')
+    if not path:
+        return DEFAULT_KEYWORD_DICTIONARY
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+# and is emitted as a structured field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+def log_fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+# One JSON object per line, for log shippers
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(log_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+# Human-readable lines with the structured fields appended as key=value
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = log_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+# Keeps a fraction of records below WARNING so per-request logging can
+# stay on under load. Warnings and errors are never dropped.
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(0.0, min(float(rate), 1.0))
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+# Configures the root handler from LOG_LEVEL, LOG_FORMAT (text|json) and
+# LOG_SAMPLE_RATE. Safe to call more than once.
+def configure_logging(level=None, fmt=None, sample_rate=None):
+    level = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+    fmt = fmt or os.environ.get('LOG_FORMAT', 'text')
+    sample_rate = float(os.environ.get('LOG_SAMPLE_RATE', 1.0) if sample_rate is None else sample_rate)
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if getattr(existing, '_internconnect', False):
+            root.removeHandler(existing)
+    handler._internconnect = True
+    root.addHandler(handler)
+    root.setLevel(level)
@@ -0,0 +1,395 @@
+import argparse
+import logging
+import sqlite3
+
+from analytics import ROLLUP_TABLES, SQLITE_ROLLUP_TABLES
+from config import DB_CONFIG
+from ingest import INTERNSHIP_FIELDS, import_internships
+from search import SEARCH_INDEXES, SQLITE_SEARCH_INDEXES
+from skill_index import SKILL_INDEX_TABLES, SQLITE_SKILL_INDEX_TABLES, backfill_skill_index
+from storage import DATABASE_ERRORS, create_storage, dialect_of
+
+try:
+    from mysql.connector import errorcode
+except ImportError:
+    errorcode = None
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERNSHIPS = [
+    ("Frontend Developer Intern", "TechCorp Solutions", "San Francisco, CA", "Remote", "3 months", "$3,000/month",
+     "Join our frontend team to build responsive web applications using React, JavaScript, and modern CSS frameworks.",
+     "JavaScript,React,HTML,CSS"),
+
+    ("Data Science Intern", "DataInsights Inc.", "New York, NY", "Hybrid", "6 months", "$4,500/month",
+     "Work with our data team to analyze large datasets and build predictive models using Python and machine learning libraries.",
+     "Python,Machine Learning,SQL,Pandas"),
+
+    ("UX/UI Design Intern", "CreativeMinds Agency", "Austin, TX", "On-site", "4 months", "$2,800/month",
+     "Design intuitive user interfaces for web and mobile applications. Collaborate with developers to implement designs.",
+     "Figma,UI/UX Design,Wireframing,Prototyping"),
+
+    ("Backend Developer Intern", "ServerStack Technologies", "Seattle, WA", "Remote", "5 months", "$3,500/month",
+     "Develop and maintain server-side applications using Node.js and MongoDB. Implement RESTful APIs and database schemas.",
+     "Node.js,MongoDB,Express,REST APIs"),
+
+    ("Marketing Intern", "GrowthHackers Marketing", "Chicago, IL", "Hybrid", "3 months", "$2,500/month",
+     "Assist in developing marketing campaigns, analyzing performance metrics, and creating content for social media channels.",
+     "Digital Marketing,Social Media,Content Creation,Analytics"),
+
+    ("Cybersecurity Intern", "SecureNet Systems", "Boston, MA", "On-site", "6 months", "$4,000/month",
+     "Learn about network security, vulnerability assessment, and ethical hacking techniques under expert supervision.",
+     "Network Security,Ethical Hacking,Linux,Python")
+]
+
+
+def seed_sample_internships(conn):
+    cursor = conn.cursor()
+    placeholders = ', '.join(['(%s, %s)'] * len(SAMPLE_INTERNSHIPS))
+    cursor.execute(f'SELECT title, company FROM internships WHERE (title, company) IN ({placeholders})',
+                   [value for internship in SAMPLE_INTERNSHIPS for value in internship[:2]])
+    existing = {(title.lower(), company.lower()) for title, company in cursor.fetchall()}
+    cursor.close()
+
+    missing = [
+        dict(zip(INTERNSHIP_FIELDS, internship)) for internship in SAMPLE_INTERNSHIPS
+        if (internship[0].lower(), internship[1].lower()) not in existing
+    ]
+    if missing:
+        import_internships(conn, enumerate(missing, 1), bump_version=False)
+    logger.info('Inserted %d sample internships', len(missing))
+
+
+def backfill_skills(conn):
+    cursor = conn.cursor()
+    indexed_internships, indexed_users = backfill_skill_index(cursor)
+    cursor.close()
+    conn.commit()
+    logger.info('Indexed skills for %d internships and %d users', indexed_internships, indexed_users)
+
+
+# Ordered schema history. Each entry is (version, description, steps), where
+# a step is a SQL string or a callable taking the connection. Where MySQL
+# and SQLite DDL differ, steps is a {dialect: steps} dict. Never edit an
+# applied migration; append a new one instead.
+MIGRATIONS = [
+    (1, 'Base tables and indexes', {'mysql': [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            name VARCHAR(255) NOT NULL,
+            phone VARCHAR(20) NOT NULL,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            skills TEXT,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS internships (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            title VARCHAR(255) NOT NULL,
+            company VARCHAR(255) NOT NULL,
+            location VARCHAR(255) NOT NULL,
+            type VARCHAR(100) NOT NULL,
+            duration VARCHAR(100) NOT NULL,
+            stipend VARCHAR(100) NOT NULL,
+            description TEXT NOT NULL,
+            skills_required TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            user_id INT NOT NULL,
+            internship_id INT NOT NULL,
+            status VARCHAR(50) DEFAULT 'Applied',
+            applied_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (internship_id) REFERENCES internships (id) ON DELETE CASCADE,
+            UNIQUE(user_id, internship_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS search_tracking (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            user_id INT NOT NULL,
+            platform VARCHAR(100) NOT NULL,
+            skills TEXT NOT NULL,
+            search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        'CREATE INDEX idx_applications_user_id ON applications(user_id)',
+        'CREATE INDEX idx_applications_internship_id ON applications(internship_id)',
+        'CREATE INDEX idx_applications_status ON applications(status)',
+        'CREATE INDEX idx_users_email ON users(email)',
+        'CREATE INDEX idx_search_tracking_user_id ON search_tracking(user_id)'
+    ], 'sqlite': [
+        # NOCASE on the lookup keys matches MySQL's case-insensitive collation
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            email TEXT COLLATE NOCASE UNIQUE NOT NULL,
+            skills TEXT,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS internships (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT COLLATE NOCASE NOT NULL,
+            company TEXT COLLATE NOCASE NOT NULL,
+            location TEXT NOT NULL,
+            type TEXT NOT NULL,
+            duration TEXT NOT NULL,
+            stipend TEXT NOT NULL,
+            description TEXT NOT NULL,
+            skills_required TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            internship_id INTEGER NOT NULL,
+            status TEXT DEFAULT 'Applied',
+            applied_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (internship_id) REFERENCES internships (id) ON DELETE CASCADE,
+            UNIQUE(user_id, internship_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS search_tracking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            platform TEXT NOT NULL,
+            skills TEXT NOT NULL,
+            search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_applications_user_id ON applications(user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_applications_internship_id ON applications(internship_id)',
+        'CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status)',
+        'CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)',
+        'CREATE INDEX IF NOT EXISTS idx_search_tracking_user_id ON search_tracking(user_id)'
+    ]}),
+    (2, 'Skill index tables', {
+        'mysql': SKILL_INDEX_TABLES + [backfill_skills],
+        'sqlite': SQLITE_SKILL_INDEX_TABLES + [backfill_skills]
+    }),
+    (3, 'Unique (title, company) on internships', {'mysql': [
+        'CREATE UNIQUE INDEX uq_internships_title_company ON internships(title, company)'
+    ], 'sqlite': [
+        # The bundled internconnect.db was seeded twice by the old init_db
+        '''
+        DELETE FROM internships WHERE id NOT IN (
+            SELECT MIN(id) FROM internships GROUP BY title COLLATE NOCASE, company COLLATE NOCASE
+        )
+        ''',
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_internships_title_company '
+        'ON internships(title COLLATE NOCASE, company COLLATE NOCASE)'
+    ]}),
+    (4, 'Sample internships', [seed_sample_internships]),
+    (5, 'Search analytics rollups', {'mysql': ROLLUP_TABLES, 'sqlite': SQLITE_ROLLUP_TABLES}),
+    (6, 'Keyset index for paging applications', [
+        'CREATE INDEX idx_applications_user_applied ON applications(user_id, applied_date, id)'
+    ]),
+    (7, 'Idempotency keys', {'mysql': [
+        '''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            user_id INT NOT NULL,
+            idempotency_key VARCHAR(100) NOT NULL,
+            request_hash CHAR(64) NOT NULL,
+            status_code SMALLINT NOT NULL,
+            response MEDIUMTEXT NOT NULL,
+            created_at DATETIME NOT NULL,
+            PRIMARY KEY (user_id, idempotency_key),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+        '''
+    ], 'sqlite': [
+        '''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            user_id INTEGER NOT NULL,
+            idempotency_key TEXT NOT NULL,
+            request_hash TEXT NOT NULL,
+            status_code INTEGER NOT NULL,
+            response TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (user_id, idempotency_key),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        '''
+    ]}),
+    (8, 'Full-text index on internships', {'mysql': SEARCH_INDEXES, 'sqlite': SQLITE_SEARCH_INDEXES}),
+    (9, 'Data version counters', {'mysql': [
+        '''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name VARCHAR(64) PRIMARY KEY,
+            version BIGINT NOT NULL
+        )
+        ''',
+        "INSERT IGNORE INTO data_versions (name, version) VALUES ('internships', 1)"
+    ], 'sqlite': [
+        '''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID
+        ''',
+        "INSERT OR IGNORE INTO data_versions (name, version) VALUES ('internships', 1)"
+    ]}),
+    (10, 'Catalog version per internship', [
+        'ALTER TABLE internships ADD COLUMN catalog_version BIGINT NOT NULL DEFAULT 0',
+        'CREATE INDEX idx_internships_catalog_version ON internships(catalog_version)'
+    ]),
+    (11, 'Async resume jobs shared between workers', {'mysql': [
+        '''
+        CREATE TABLE IF NOT EXISTS resume_jobs (
+            id CHAR(32) PRIMARY KEY,
+            filename VARCHAR(255) NOT NULL,
+            status VARCHAR(16) NOT NULL,
+            submitted_at DOUBLE NOT NULL,
+            finished_at DOUBLE NULL,
+            analysis MEDIUMTEXT NULL,
+            error TEXT NULL
+        )
+        ''',
+        'CREATE INDEX idx_resume_jobs_submitted_at ON resume_jobs(submitted_at)'
+    ], 'sqlite': [
+        '''
+        CREATE TABLE IF NOT EXISTS resume_jobs (
+            id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            status TEXT NOT NULL,
+            submitted_at REAL NOT NULL,
+            finished_at REAL,
+            analysis TEXT,
+            error TEXT
+        ) WITHOUT ROWID
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_resume_jobs_submitted_at ON resume_jobs(submitted_at)'
+    ]})
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# Databases bootstrapped by the old import-time init_db already have some
+# of these objects, so "already exists" errors count as applied
+def already_applied(error):
+    if isinstance(error, sqlite3.OperationalError):
+        return 'already exists' in str(error) or 'duplicate column name' in str(error)
+    return errorcode is not None and getattr(error, 'errno', None) in (
+        errorcode.ER_TABLE_EXISTS_ERROR, errorcode.ER_DUP_KEYNAME, errorcode.ER_DUP_FIELDNAME)
+
+
+def _missing_table(error):
+    if isinstance(error, sqlite3.OperationalError):
+        return 'no such table' in str(error)
+    return errorcode is not None and getattr(error, 'errno', None) == errorcode.ER_NO_SUCH_TABLE
+
+
+def steps_for(steps, dialect):
+    return steps[dialect] if isinstance(steps, dict) else steps
+
+
+def ensure_migrations_table(conn):
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.close()
+
+
+# Highest applied version, or 0 for a database that has never been migrated
+def current_version(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT MAX(version) FROM schema_migrations')
+        row = cursor.fetchone()
+    except DATABASE_ERRORS as e:
+        if _missing_table(e):
+            return 0
+        raise
+    finally:
+        cursor.close()
+    return row[0] or 0
+
+
+def migrate(storage, target=None):
+    target = LATEST_VERSION if target is None else target
+    storage.ensure_database()
+
+    conn = storage.connect()
+    try:
+        ensure_migrations_table(conn)
+        version = current_version(conn)
+        if version >= target:
+            logger.info('Schema is up to date (version %s)', version)
+            return version
+
+        for migration_version, description, steps in MIGRATIONS:
+            if migration_version <= version or migration_version > target:
+                continue
+            logger.info('Applying migration %s: %s', migration_version, description)
+            for step in steps_for(steps, dialect_of(conn)):
+                if callable(step):
+                    step(conn)
+                    continue
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(step)
+                except DATABASE_ERRORS as e:
+                    if not already_applied(e):
+                        raise
+                finally:
+                    cursor.close()
+
+            cursor = conn.cursor()
+            cursor.execute('INSERT INTO schema_migrations (version, description) VALUES (%s, %s)',
+                           (migration_version, description))
+            cursor.close()
+            conn.commit()
+            version = migration_version
+
+        logger.info('Schema migrated to version %s', version)
+        return version
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='InternConnect schema migrations')
+    parser.add_argument('command', nargs='?', default='upgrade', choices=['upgrade', 'status'])
+    parser.add_argument('--target', type=int, help='migrate up to this version (default: latest)')
+    args = parser.parse_args(argv)
+
+    storage = create_storage(DB_CONFIG)
+
+    if args.command == 'status':
+        conn = storage.connect()
+        try:
+            version = current_version(conn)
+        finally:
+            conn.close()
+        print(f"Schema version {version} (latest {LATEST_VERSION})")
+        return
+
+    migrate(storage, args.target)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 500
+
+# Public column name -> SQL expression. The keyset columns are always
+# selected, whatever projection the caller asks for.
+USER_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'phone': 'phone',
+    'skills': 'skills',
+    'created_at': 'created_at'
+}
+USER_KEY = ('id',)
+
+APPLICATION_FIELDS = {
+    'id': 'a.id',
+    'user_id': 'a.user_id',
+    'internship_id': 'a.internship_id',
+    'status': 'a.status',
+    'applied_date': 'a.applied_date',
+    'title': 'i.title',
+    'company': 'i.company',
+    'location': 'i.location',
+    'type': 'i.type',
+    'stipend': 'i.stipend'
+}
+APPLICATION_KEY = ('applied_date', 'id')
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        size = int(value) if value else default
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(size, maximum))
+
+
+# Turns "?fields=name,email" into a SELECT list. Unknown names are an
+# error rather than silently dropped so typos don't look like empty data.
+def select_list(value, allowed, key):
+    if value:
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    else:
+        names = list(allowed)
+    names = [name for name in key if name not in names] + names
+    return ', '.join(allowed[name] if allowed[name] == name else f'{allowed[name]} AS {name}' for name in names)
+
+
+# Cursors are the keyset values of the last row served, base64-encoded
+# so clients treat them as opaque
+def encode_keyset(row, key):
+    values = [row[name].isoformat() if isinstance(row[name], datetime) else row[name] for name in key]
+    payload = json.dumps(values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_keyset(cursor, types):
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+# Queries ask for limit + 1 rows so the presence of a next page is known
+# without a COUNT; returns (rows, next_cursor)
+def paginate(rows, limit, key):
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_keyset(rows[-1], key)
+
+
+# Yields one JSON document per line, pulling rows from the server a batch
+# at a time, so memory use doesn't grow with the size of the result
+def iter_ndjson(cursor, dumps, batch_size=EXPORT_BATCH_SIZE):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield ''.join(dumps(row) + '\n' for row in rows)
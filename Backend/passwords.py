@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from process_pools import pool_context
+
+# Werkzeug method string, e.g. "pbkdf2:sha256:600000" or "scrypt:32768:8:1".
+# Changing it only affects new hashes; old ones are upgraded on login.
+DEFAULT_METHOD = os.environ.get('PASSWORD_HASH_METHOD', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}')
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f'Too many attempts, retry in {retry_after:.0f}s')
+        self.retry_after = retry_after
+
+
+# Spells out the defaults the way Werkzeug records them in the hash, so a
+# stored hash can be compared to the configured method without hashing
+def normalize_method(method):
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = args if args else (2 ** 15, 8, 1)
+        return f'scrypt:{int(n)}:{int(r)}:{int(p)}'
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f'Unsupported password hash method: {method}')
+
+
+def needs_rehash(stored_hash, method):
+    return stored_hash.split('$', 1)[0] != normalize_method(method)
+
+
+# Runs in a pool worker. Returns (matches, new_hash), where new_hash is set
+# when the password matched but was stored with outdated parameters.
+def verify_and_upgrade(stored_hash, password, method):
+    if not check_password_hash(stored_hash, password):
+        return False, None
+    if needs_rehash(stored_hash, method):
+        return True, generate_password_hash(password, method)
+    return True, None
+
+
+# Password hashing on a process pool, so key stretching doesn't hold the
+# GIL of the web worker. With workers=0 hashing runs inline instead. The
+# pool starts its workers like the resume pool does; see process_pools.py
+# for what each one imports.
+class PasswordHasher:
+    def __init__(self, method=DEFAULT_METHOD, workers=2, timeout=10.0):
+        self.method = normalize_method(method)
+        self.workers = max(0, int(workers))
+        self.timeout = float(timeout)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    # Returns (matches, new_hash); store new_hash if it is not None
+    def verify(self, stored_hash, password):
+        return self._run(verify_and_upgrade, stored_hash, password, self.method)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool:
+            # A crashed worker poisons the whole pool; start a fresh one
+            with self._lock:
+                self._executor = None
+            future = self._get_executor().submit(fn, *args)
+        return future.result(timeout=self.timeout)
+
+    def _get_executor(self):
+        # Created on first use so importing the app doesn't start workers
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context(__name__))
+            return self._executor
+
+
+# Per-account token bucket: up to `burst` verifications at once, refilled
+# at `burst` per `window` seconds. Buckets are kept for the most recently
+# seen `max_keys` accounts.
+class AttemptLimiter:
+    def __init__(self, burst=5, window=60.0, max_keys=10000):
+        self.burst = max(1, int(burst))
+        self.rate = self.burst / float(window)
+        self.max_keys = int(max_keys)
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self._limited = 0
+
+    # Takes one token for `key`, or raises RateLimited
+    def acquire(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self._limited += 1
+                raise RateLimited((1 - tokens) / self.rate)
+            self._buckets[key] = (tokens - 1, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'tracked': len(self._buckets), 'limited': self._limited}
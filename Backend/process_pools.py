@@ -0,0 +1,28 @@
+import multiprocessing
+
+_preload = set()
+
+
+# Multiprocessing context for the app's process pools. They are created
+# lazily on web worker threads, and forking a threaded process copies
+# locks other threads may hold at that instant, so pool workers are started
+# from a fork server instead (spawn where there is none). The fork server
+# is shared by every pool in the process and imports the `preload` modules
+# once, so workers start with them loaded.
+#
+# Every pool worker still re-imports the parent's main script as
+# __mp_main__ before it runs a task. Under gunicorn that is gunicorn's
+# launcher. Under `python app.py` it is app.py, which is why app.py only
+# builds cheap, lazy objects at import time, costing about 0.3 s per
+# worker, almost all of it Flask and NumPy imports. The dev server and
+# migrations stay under its `if __name__ == '__main__'` guard. Any other
+# script that starts these pools needs the same guard. Without it, the
+# worker's re-import starts a pool of its own and multiprocessing aborts
+# with a "bootstrapping phase" RuntimeError.
+def pool_context(*preload):
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    _preload.update(preload)
+    context.set_forkserver_preload(sorted(_preload))
+    return context
@@ -0,0 +1,77 @@
+import base64
+import heapq
+import json
+import math
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Scores are rounded so the (score, id) keyset in a cursor compares
+# exactly against freshly computed scores on the next page request
+SCORE_PRECISION = 6
+
+
+# Smoothed inverse document frequency: rare skills count for more
+def skill_weights(doc_freq, total_internships):
+    return {
+        skill_id: math.log((total_internships + 1) / (df + 1)) + 1
+        for skill_id, df in doc_freq.items()
+    }
+
+
+# Weighted Jaccard over skill sets: IDF mass of the shared skills divided
+# by IDF mass of the union
+def score_internships(user_skill_ids, internship_skills, weights):
+    user_skill_ids = set(user_skill_ids)
+    user_mass = sum(weights.get(skill_id, 1.0) for skill_id in user_skill_ids)
+
+    scores = {}
+    for internship_id, skill_ids in internship_skills.items():
+        shared = 0.0
+        internship_mass = 0.0
+        for skill_id in skill_ids:
+            weight = weights.get(skill_id, 1.0)
+            internship_mass += weight
+            if skill_id in user_skill_ids:
+                shared += weight
+        union = user_mass + internship_mass - shared
+        if shared and union:
+            scores[internship_id] = round(shared / union, SCORE_PRECISION)
+    return scores
+
+
+# Best k (internship_id, score) pairs ordered by score desc, id asc,
+# starting strictly after the `after` keyset. heapq.nsmallest keeps only
+# k items in its heap, so this is O(n log k) rather than a full sort.
+def top_k(scores, k, after=None):
+    candidates = scores.items()
+    if after is not None:
+        after_score, after_id = after
+        candidates = (
+            (internship_id, score) for internship_id, score in candidates
+            if score < after_score or (score == after_score and internship_id > after_id)
+        )
+    return heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
+
+
+def encode_cursor(score, internship_id):
+    payload = json.dumps({'s': score, 'id': internship_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(payload['s']), int(payload['id'])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_page_size(value):
+    try:
+        size = int(value) if value else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(size, MAX_PAGE_SIZE))
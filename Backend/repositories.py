@@ -0,0 +1,413 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+from analytics import query_search_counts, refresh_search_rollups
+from ingest import INTERNSHIP_COLUMNS
+from search import search_internships
+from skill_index import index_user_skills
+from storage import dialect_of
+
+# Data access for the API routes. Each repository borrows a cursor from
+# `db_cursor` (the app's pooled, timed cursor factory) per call, and its
+# SQL is written once for both storage engines (see storage.py).
+# Caching and invalidation stay in the routes.
+
+INTERNSHIP_SELECT = ', '.join('i.' + column for column in INTERNSHIP_COLUMNS)
+
+# An internship row plus the user's application status, or 'Available'
+INTERNSHIP_WITH_STATUS = f'''
+    SELECT {INTERNSHIP_SELECT},
+           COALESCE(a.status, 'Available') as status,
+           COALESCE(a.applied_date, '') as applied_date
+'''
+
+
+class UserRepository:
+    def __init__(self, db_cursor):
+        self.db_cursor = db_cursor
+
+    # Parsed skill list, or None if the user doesn't exist
+    def get_skills(self, user_id):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('SELECT skills FROM users WHERE id = %s', (user_id,))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return row['skills'].split(',') if row['skills'] else []
+
+    def email_exists(self, email):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('SELECT id FROM users WHERE email = %s', (email,))
+            return cursor.fetchone() is not None
+
+    def get_by_email(self, email):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('SELECT * FROM users WHERE email = %s', (email,))
+            return cursor.fetchone()
+
+    # Inserts the user and indexes their skills in one transaction;
+    # returns the new id. A duplicate email raises the driver's
+    # integrity error (see storage.is_duplicate_key).
+    def create(self, name, phone, email, skills, password_hash):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('''
+                INSERT INTO users (name, phone, email, skills, password_hash)
+                VALUES (%s, %s, %s, %s, %s)
+            ''', (name, phone, email, ','.join(skills), password_hash))
+            user_id = cursor.lastrowid
+            index_user_skills(cursor, user_id, skills)
+            conn.commit()
+        return user_id
+
+    # Compare-and-set: skipped if the hash changed since it was read
+    def replace_password_hash(self, user_id, old_hash, new_hash):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('UPDATE users SET password_hash = %s WHERE id = %s AND password_hash = %s',
+                           (new_hash, user_id, old_hash))
+            conn.commit()
+            return cursor.rowcount > 0
+
+    # Keyset page query for /api/users: (sql, params) without the LIMIT
+    def list_query(self, columns, after_id):
+        return f'SELECT {columns} FROM users WHERE id > %s ORDER BY id', [after_id or 0]
+
+
+class InternshipRepository:
+    def __init__(self, db_cursor):
+        self.db_cursor = db_cursor
+
+    # Rows for the /api/internships views. 'All' lists the internships
+    # sharing a skill with the user (every internship if the user has no
+    # skills); any other filter lists the user's applications in that status.
+    def list_for_user(self, user_id, filter_type, has_skills):
+        with self.db_cursor() as (conn, cursor):
+            if filter_type == 'All':
+                if has_skills:
+                    # Walk the skill index: user's skills -> internships that list them
+                    cursor.execute(INTERNSHIP_WITH_STATUS + '''
+                        FROM (
+                            SELECT DISTINCT isk.internship_id
+                            FROM user_skills us
+                            JOIN internship_skills isk ON isk.skill_id = us.skill_id
+                            WHERE us.user_id = %s
+                        ) m
+                        JOIN internships i ON i.id = m.internship_id
+                        LEFT JOIN applications a ON i.id = a.internship_id AND a.user_id = %s
+                    ''', (user_id, user_id))
+                else:
+                    cursor.execute(INTERNSHIP_WITH_STATUS + '''
+                        FROM internships i
+                        LEFT JOIN applications a ON i.id = a.internship_id AND a.user_id = %s
+                    ''', (user_id,))
+            elif has_skills:
+                cursor.execute(f'''
+                    SELECT {INTERNSHIP_SELECT}, a.status, a.applied_date
+                    FROM applications a
+                    JOIN internships i ON i.id = a.internship_id
+                    WHERE a.user_id = %s AND a.status = %s
+                      AND EXISTS (
+                          SELECT 1
+                          FROM internship_skills isk
+                          JOIN user_skills us ON us.skill_id = isk.skill_id AND us.user_id = a.user_id
+                          WHERE isk.internship_id = i.id
+                      )
+                ''', (user_id, filter_type))
+            else:
+                cursor.execute(f'''
+                    SELECT {INTERNSHIP_SELECT}, a.status, a.applied_date
+                    FROM internships i
+                    JOIN applications a ON i.id = a.internship_id
+                    WHERE a.user_id = %s AND a.status = %s
+                ''', (user_id, filter_type))
+            return cursor.fetchall()
+
+    # Everything recommendation scoring needs in one checkout: the user's
+    # skill ids and the full skill sets of every internship sharing one.
+    # Returns None if the user doesn't exist.
+    def recommendation_candidates(self, user_id):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('SELECT id FROM users WHERE id = %s', (user_id,))
+            if not cursor.fetchone():
+                return None
+
+            cursor.execute('SELECT skill_id FROM user_skills WHERE user_id = %s', (user_id,))
+            user_skill_ids = [row['skill_id'] for row in cursor.fetchall()]
+
+            cursor.execute('''
+                SELECT isk.internship_id, isk.skill_id
+                FROM (
+                    SELECT DISTINCT cand.internship_id
+                    FROM user_skills us
+                    JOIN internship_skills cand ON cand.skill_id = us.skill_id
+                    WHERE us.user_id = %s
+                ) m
+                JOIN internship_skills isk ON isk.internship_id = m.internship_id
+            ''', (user_id,))
+            internship_skills = {}
+            for row in cursor.fetchall():
+                internship_skills.setdefault(row['internship_id'], []).append(row['skill_id'])
+        return user_skill_ids, internship_skills
+
+    # ({skill_id: number of internships listing it}, total internships)
+    def skill_document_frequencies(self):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('SELECT skill_id, COUNT(*) AS df FROM internship_skills GROUP BY skill_id')
+            doc_freq = {row['skill_id']: row['df'] for row in cursor.fetchall()}
+            cursor.execute('SELECT COUNT(*) AS total FROM internships')
+            total = cursor.fetchone()['total']
+        return doc_freq, total
+
+    # (catalog version, application count, last application id) for the
+    # user's internship view, or None if the user doesn't exist. Index
+    # lookups only; it changes whenever an import commits or the user
+    # applies, the only writes that change what list_for_user returns.
+    def view_version(self, user_id):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('''
+                SELECT (SELECT version FROM data_versions WHERE name = 'internships') AS catalog,
+                       COUNT(a.id) AS applications,
+                       MAX(a.id) AS last_application
+                FROM users u
+                LEFT JOIN applications a ON a.user_id = u.id
+                WHERE u.id = %s
+                GROUP BY u.id
+            ''', (user_id,))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return row['catalog'], row['applications'], row['last_application']
+
+    # (catalog version, [(id, skills_required, description)]) for rows
+    # written after `after_version`, or for every row when it is None. The
+    # rows are only read once the version has moved on; a write committing
+    # between the two reads is returned again next time, never missed.
+    def match_documents(self, after_version=None):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute("SELECT version FROM data_versions WHERE name = 'internships'")
+            row = cursor.fetchone()
+            version = row['version'] if row else 0
+            if after_version is not None and version == after_version:
+                return version, []
+
+            query = 'SELECT id, skills_required, description FROM internships'
+            if after_version is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query + ' WHERE catalog_version > %s', (after_version,))
+            return version, [(row['id'], row['skills_required'], row['description']) for row in cursor.fetchall()]
+
+    # {id: row} for the given ids; unknown ids are left out
+    def get_many(self, internship_ids):
+        if not internship_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(internship_ids))
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute(f'SELECT {INTERNSHIP_SELECT} FROM internships i WHERE i.id IN ({placeholders})',
+                           list(internship_ids))
+            return {row['id']: row for row in cursor.fetchall()}
+
+    # One page of (row, score) full-text matches (see search.py)
+    def search(self, terms, type=None, location=None, limit=20, after=None):
+        with self.db_cursor() as (conn, cursor):
+            return search_internships(cursor, dialect_of(conn), terms, type, location, limit, after)
+
+    # {id: row with the user's application status} for the given ids
+    def with_status(self, user_id, internship_ids):
+        if not internship_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(internship_ids))
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute(INTERNSHIP_WITH_STATUS + f'''
+                FROM internships i
+                LEFT JOIN applications a ON i.id = a.internship_id AND a.user_id = %s
+                WHERE i.id IN ({placeholders})
+            ''', [user_id] + list(internship_ids))
+            return {row['id']: row for row in cursor.fetchall()}
+
+
+APPLY_OUTCOMES = ('created', 'already_applied', 'not_found')
+
+
+class ApplicationRepository:
+    def __init__(self, db_cursor):
+        self.db_cursor = db_cursor
+
+    # Applies for every internship in `internship_ids` with one multi-row
+    # INSERT IGNORE; the UNIQUE(user_id, internship_id) key turns repeats
+    # into no-ops. Returns {internship_id: outcome}, where outcome is one
+    # of APPLY_OUTCOMES, or None if the user doesn't exist. Outcomes come
+    # from the read before the insert, so two concurrent requests for the
+    # same pair may both report 'created'; only one row is ever written.
+    def create_many(self, user_id, internship_ids):
+        internship_ids = list(dict.fromkeys(internship_ids))
+        if not internship_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(internship_ids))
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('SELECT id FROM users WHERE id = %s', (user_id,))
+            if not cursor.fetchone():
+                return None
+
+            cursor.execute(f'''
+                SELECT i.id, a.id AS application_id
+                FROM internships i
+                LEFT JOIN applications a ON a.internship_id = i.id AND a.user_id = %s
+                WHERE i.id IN ({placeholders})
+            ''', [user_id] + internship_ids)
+            found = {row['id']: row['application_id'] for row in cursor.fetchall()}
+
+            outcomes = {}
+            new_ids = []
+            for internship_id in internship_ids:
+                if internship_id not in found:
+                    outcomes[internship_id] = 'not_found'
+                elif found[internship_id] is not None:
+                    outcomes[internship_id] = 'already_applied'
+                else:
+                    outcomes[internship_id] = 'created'
+                    new_ids.append(internship_id)
+
+            if new_ids:
+                placeholders = ', '.join(["(%s, %s, 'Applied')"] * len(new_ids))
+                cursor.execute(f'INSERT IGNORE INTO applications (user_id, internship_id, status) VALUES {placeholders}',
+                               [value for internship_id in new_ids for value in (user_id, internship_id)])
+                conn.commit()
+        return outcomes
+
+    # Keyset page query for /api/applications, newest first: (sql,
+    # params) without the LIMIT. (applied_date, id) breaks ties between
+    # same-second rows.
+    def list_query(self, columns, user_id, after):
+        sql = f'''
+            SELECT {columns}
+            FROM applications a
+            JOIN internships i ON a.internship_id = i.id
+            WHERE a.user_id = %s
+        '''
+        params = [user_id]
+        if after:
+            sql += ' AND (a.applied_date < %s OR (a.applied_date = %s AND a.id < %s))'
+            params += [after[0], after[0], after[1]]
+        sql += ' ORDER BY a.applied_date DESC, a.id DESC'
+        return sql, params
+
+
+class SearchRepository:
+    def __init__(self, db_cursor):
+        self.db_cursor = db_cursor
+
+    # Multi-row insert of (user_id, platform, skills) events; returns how
+    # many were written. Events for users deleted since they were tracked
+    # are dropped up front rather than failing the batch: SQLite's INSERT
+    # OR IGNORE doesn't cover foreign key errors.
+    def insert_events(self, events):
+        user_ids = sorted({str(event[0]) for event in events})
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        with self.db_cursor(dictionary=False) as (conn, cursor):
+            cursor.execute(f'SELECT id FROM users WHERE id IN ({placeholders})', user_ids)
+            known = {str(row[0]) for row in cursor.fetchall()}
+            events = [event for event in events if str(event[0]) in known]
+            if not events:
+                return 0
+
+            placeholders = ', '.join(['(%s, %s, %s)'] * len(events))
+            cursor.execute(f'INSERT IGNORE INTO search_tracking (user_id, platform, skills) VALUES {placeholders}',
+                           [value for event in events for value in event])
+            conn.commit()
+        return len(events)
+
+    # Folds new events into the daily rollups (see analytics.py)
+    def refresh_rollups(self):
+        with self.db_cursor(dictionary=False) as (conn, cursor):
+            return refresh_search_rollups(conn)
+
+    def counts(self, group_by, days, platform, limit):
+        with self.db_cursor() as (conn, cursor):
+            return query_search_counts(cursor, group_by, days, platform, limit)
+
+
+# Stored responses for client-supplied Idempotency-Key headers, so a
+# retried request gets the original answer instead of running again
+class IdempotencyRepository:
+    def __init__(self, db_cursor, ttl=timedelta(hours=24)):
+        self.db_cursor = db_cursor
+        self.ttl = ttl
+
+    # (request_hash, status_code, body) of an unexpired key, or None
+    def get(self, user_id, key):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('''
+                SELECT request_hash, status_code, response FROM idempotency_keys
+                WHERE user_id = %s AND idempotency_key = %s AND created_at >= %s
+            ''', (user_id, key, datetime.now() - self.ttl))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return row['request_hash'], row['status_code'], json.loads(row['response'])
+
+    # First writer wins; the same user's expired keys are purged on the way
+    def save(self, user_id, key, request_hash, status_code, body):
+        now = datetime.now()
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('DELETE FROM idempotency_keys WHERE user_id = %s AND created_at < %s',
+                           (user_id, now - self.ttl))
+            cursor.execute('''
+                INSERT IGNORE INTO idempotency_keys
+                (user_id, idempotency_key, request_hash, status_code, response, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            ''', (user_id, key, request_hash, status_code, json.dumps(body), now))
+            conn.commit()
+
+
+# Async resume jobs in the database, so a poll can land on any worker (see
+# ResumeJobQueue). Rows are deleted `ttl` seconds after submission, purged
+# on the way in like idempotency keys.
+class ResumeJobRepository:
+    def __init__(self, db_cursor, ttl=600.0):
+        self.db_cursor = db_cursor
+        self.ttl = float(ttl)
+
+    # A job can finish before its create() is written, so create() never
+    # overwrites a row and finish() inserts one if it's missing
+    def create(self, job):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('DELETE FROM resume_jobs WHERE submitted_at < %s', (time.time() - self.ttl,))
+            cursor.execute('''
+                INSERT IGNORE INTO resume_jobs (id, filename, status, submitted_at, finished_at, analysis, error)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ''', self._row(job))
+            conn.commit()
+
+    def finish(self, job):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('''
+                INSERT INTO resume_jobs (id, filename, status, submitted_at, finished_at, analysis, error)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    status = VALUES(status),
+                    finished_at = VALUES(finished_at),
+                    analysis = VALUES(analysis),
+                    error = VALUES(error)
+            ''', self._row(job))
+            conn.commit()
+
+    # The job dict ResumeJobQueue.get() returns, or None
+    def get(self, job_id):
+        with self.db_cursor() as (conn, cursor):
+            cursor.execute('''
+                SELECT id, filename, status, submitted_at, finished_at, analysis, error
+                FROM resume_jobs WHERE id = %s AND submitted_at >= %s
+            ''', (job_id, time.time() - self.ttl))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        job = dict(row)
+        job['analysis'] = json.loads(row['analysis']) if row['analysis'] else None
+        return job
+
+    @staticmethod
+    def _row(job):
+        analysis = json.dumps(job['analysis']) if job['analysis'] is not None else None
+        return (job['id'], (job['filename'] or '')[:255], job['status'], job['submitted_at'], job['finished_at'],
+                analysis, job['error'])
@@ -0,0 +1,290 @@
+import codecs
+import io
+import os
+import re
+import time
+import zipfile
+import zlib
+
+from keyword_matcher import KeywordMatcher, load_keyword_dictionary
+
+# Compiled once per process from the built-in or RESUME_KEYWORDS_FILE dictionary
+keyword_matcher = KeywordMatcher(load_keyword_dictionary())
+
+# Per-upload limits. Bytes are a hard limit; pages and seconds stop
+# extraction early and mark the analysis as truncated, with
+# truncated_reason 'pages' or 'deadline' ('saturated' when the scan stops
+# because every section and keyword has been found, so only word_count,
+# a lower bound then, could still grow).
+MAX_UPLOAD_BYTES = int(os.environ.get('RESUME_MAX_BYTES', 5 * 1024 * 1024))
+MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', 50))
+MAX_SECONDS = float(os.environ.get('RESUME_MAX_SECONDS', 10))
+
+# Bump when scoring changes so cached analyses are recomputed
+ANALYZER_VERSION = 4
+
+SHORT_RESUME_WORDS = 200
+LONG_RESUME_WORDS = 800
+MAX_KEYWORD_POINTS = 30
+
+TXT_BLOCK_SIZE = 64 * 1024
+
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt')
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+# `reason` is 'pages' or 'deadline'
+class ExtractionLimitReached(Exception):
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+# Reads an upload into memory, refusing anything over max_bytes without
+# buffering more than max_bytes + 1 of it
+def read_upload(file, max_bytes=None):
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    data = file.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise UploadTooLarge(f'File is larger than {max_bytes // 1024} KB')
+    return data
+
+
+# Resume entries of a ZIP archive, skipping directories and OS metadata
+def zip_resume_entries(archive):
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+        and not os.path.basename(info.filename).startswith('.')
+    ]
+
+
+# Yields (filename, data) for each entry, reading one member into memory
+# at a time. A member that can't be used (unsupported type, too large,
+# encrypted, corrupt) yields the exception in place of its data.
+def iter_zip_resumes(archive, entries, max_bytes=None):
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    for info in entries:
+        if not info.filename.lower().endswith(RESUME_EXTENSIONS):
+            yield info.filename, ValueError('Unsupported file format')
+            continue
+        try:
+            # The declared size can lie, so the read is capped as well
+            if info.file_size > max_bytes:
+                raise UploadTooLarge(f'File is larger than {max_bytes // 1024} KB')
+            with archive.open(info) as member:
+                data = read_upload(member, max_bytes)
+        except (UploadTooLarge, zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError, OSError) as e:
+            yield info.filename, e
+            continue
+        yield info.filename, data
+
+
+# Yields the document a page (PDF), paragraph (DOCX) or block (TXT) at a
+# time, stopping once max_pages chunks or max_seconds have been used
+def iter_text_chunks(filename, file, max_pages=None, max_seconds=None):
+    filename = filename.lower()
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    deadline = time.monotonic() + (MAX_SECONDS if max_seconds is None else max_seconds)
+
+    # Parser libraries are imported on first use to keep app startup fast
+    if filename.endswith('.pdf'):
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_number, page in enumerate(pdf_reader.pages):
+            if page_number >= max_pages:
+                raise ExtractionLimitReached('pages')
+            if time.monotonic() > deadline:
+                raise ExtractionLimitReached('deadline')
+            yield page.extract_text() or ''
+
+    elif filename.endswith(('.doc', '.docx')):
+        import docx
+        doc = docx.Document(file)
+        for paragraph in doc.paragraphs:
+            if time.monotonic() > deadline:
+                raise ExtractionLimitReached('deadline')
+            yield paragraph.text + '\n'
+
+    elif filename.endswith('.txt'):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        while True:
+            block = file.read(TXT_BLOCK_SIZE)
+            if not block:
+                break
+            yield decoder.decode(block)
+        yield decoder.decode(b'', final=True)
+
+    else:
+        raise ValueError('Unsupported file format')
+
+
+# Identifies everything that affects an analysis result
+def analysis_version():
+    return f'{ANALYZER_VERSION}-{keyword_matcher.version}-{MAX_PAGES}'
+
+
+# A result cut short by the wall-clock deadline depends on how busy the
+# machine was, so it must not be cached; every other result depends only
+# on the upload and analysis_version()
+def cacheable(analysis):
+    return analysis.get('truncated_reason') != 'deadline'
+
+
+# Entry point for worker processes, which receive the raw upload bytes
+def analyze_resume_bytes(filename, data, timings=None):
+    return analyze_resume_stream(iter_text_chunks(filename, io.BytesIO(data)), timings=timings)
+
+
+# Consumes chunks until the document ends, a limit is hit, or nothing
+# further in the document could change the score or the keyword lists. If `timings` is a dict,
+# time spent producing chunks and scanning them is added to its
+# 'extract_seconds' and 'analyze_seconds'.
+def analyze_resume_stream(chunks, matcher=None, timings=None):
+    scan = ResumeScan(matcher)
+    extract_seconds = analyze_seconds = 0.0
+    chunks = iter(chunks)
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            finally:
+                extract_seconds += time.perf_counter() - started
+
+            started = time.perf_counter()
+            scan.feed(chunk)
+            analyze_seconds += time.perf_counter() - started
+            if scan.saturated:
+                scan.truncated = True
+                scan.truncated_reason = 'saturated'
+                break
+    except ExtractionLimitReached as e:
+        scan.truncated = True
+        scan.truncated_reason = e.reason
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+    started = time.perf_counter()
+    result = scan.result()
+    analyze_seconds += time.perf_counter() - started
+    if timings is not None:
+        timings['extract_seconds'] = timings.get('extract_seconds', 0.0) + extract_seconds
+        timings['analyze_seconds'] = timings.get('analyze_seconds', 0.0) + analyze_seconds
+    return result
+
+
+# Incremental resume analysis state. Each chunk is scanned together with
+# the tail of the previous one so terms spanning a page break still match.
+class ResumeScan:
+    TAIL_CHARS = 64
+    _FIRST_WHITESPACE = re.compile(r'\s')
+
+    def __init__(self, matcher=None):
+        self.matcher = matcher or keyword_matcher
+        self.sections = set()
+        self.keywords = set()
+        self.word_count = 0
+        self.truncated = False
+        self.truncated_reason = None
+        self._tail = ''
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        sections, keywords = self.matcher.scan(self._tail + chunk)
+        self.sections |= sections
+        self.keywords |= keywords
+        self.word_count += len(chunk.split())
+
+        # Start the carried tail on a word boundary to avoid matching a suffix
+        tail = chunk[-self.TAIL_CHARS:]
+        boundary = self._FIRST_WHITESPACE.search(tail)
+        self._tail = tail[boundary.start():] if boundary and len(chunk) > self.TAIL_CHARS else tail
+
+    @property
+    def keyword_points(self):
+        return min(round(sum(self.matcher.weights[k] for k in self.keywords) * 3), MAX_KEYWORD_POINTS)
+
+    # A maxed-out keyword score isn't enough: the found/missing lists and
+    # catalog matching use every keyword, so scanning goes on until all of
+    # them have turned up
+    @property
+    def saturated(self):
+        return (
+            self.word_count > LONG_RESUME_WORDS
+            and len(self.sections) == len(self.matcher.sections)
+            and len(self.keywords) == len(self.matcher.keywords)
+        )
+
+    def result(self):
+        matcher = self.matcher
+        score = 0
+        suggestions = []
+
+        found_sections = {}
+        for section in matcher.sections:
+            if section in self.sections:
+                found_sections[section] = True
+                score += 15
+            else:
+                found_sections[section] = False
+                suggestions.append(f"Add a {section.replace('_', ' ')} section")
+
+        tech_keywords = matcher.keywords
+        found_keywords = [k for k in tech_keywords if k in self.keywords]
+
+        score += self.keyword_points
+
+        if len(found_keywords) < 5:
+            suggestions.append("Add more technical skills and keywords relevant to your target internships")
+
+        word_count = self.word_count
+        if word_count < SHORT_RESUME_WORDS:
+            suggestions.append("Resume seems too short. Add more details about your projects and experience")
+            score -= 10
+        elif word_count > LONG_RESUME_WORDS:
+            suggestions.append("Resume might be too long. Consider condensing to 1-2 pages")
+            score -= 5
+        else:
+            score += 10
+
+        if score >= 90:
+            category = "Excellent"
+        elif score >= 80:
+            category = "Good"
+        elif score >= 70:
+            category = "Fair"
+        elif score >= 60:
+            category = "Poor"
+        else:
+            category = "Needs Improvement"
+
+        keyword_analysis = {
+            'technical_skills': {
+                'found': found_keywords,
+                'missing': [k for k in tech_keywords if k not in found_keywords][:10]
+            },
+            'sections': {
+                'found': [k for k, v in found_sections.items() if v],
+                'missing': [k for k, v in found_sections.items() if not v]
+            }
+        }
+
+        return {
+            'ats_score': score,
+            'score_category': category,
+            'suggestions': suggestions[:5],
+            'keyword_analysis': keyword_analysis,
+            'word_count': word_count,
+            'sections_found': len([v for v in found_sections.values() if v]),
+            'truncated': self.truncated,
+            'truncated_reason': self.truncated_reason
+        }
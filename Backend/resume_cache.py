@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from cache import MISSING, Cache
+
+
+# Two-tier cache of resume analyses keyed by upload content. Keys embed
+# the analyzer version, so changing the keyword dictionary or scoring
+# makes every old entry unreachable; the disk tier also deletes them.
+class ResumeResultCache:
+    def __init__(self, version, memory_size=256, db_path=None):
+        self.version = version
+        self.memory = Cache('resume_results', maxsize=memory_size)
+        self.db_path = db_path
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._disk_hits = 0
+        self._disk_misses = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('''
+                CREATE TABLE IF NOT EXISTS resume_analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            self._db.execute('DELETE FROM resume_analysis_cache WHERE version <> ?', (version,))
+            self._db.commit()
+
+    def key_for(self, filename, data):
+        extension = os.path.splitext(filename or '')[1].lower()
+        digest = hashlib.sha256(data).hexdigest()
+        return f'{self.version}:{extension}:{digest}'
+
+    def get(self, key):
+        analysis = self.memory.get(key)
+        if analysis is not MISSING:
+            return analysis
+        if not self._db:
+            return None
+
+        with self._db_lock:
+            row = self._db.execute('SELECT analysis FROM resume_analysis_cache WHERE key = ?', (key,)).fetchone()
+            if not row:
+                self._disk_misses += 1
+                return None
+            self._disk_hits += 1
+
+        analysis = json.loads(row[0])
+        self.memory.set(key, analysis)
+        return analysis
+
+    def set(self, key, analysis):
+        self.memory.set(key, analysis)
+        if not self._db:
+            return
+        with self._db_lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO resume_analysis_cache (key, version, analysis, created_at) VALUES (?, ?, ?, ?)',
+                (key, self.version, json.dumps(analysis), time.time())
+            )
+            self._db.commit()
+
+    def stats(self):
+        stats = {'version': self.version, 'memory': self.memory.stats()}
+        if self._db:
+            with self._db_lock:
+                stats['disk'] = {'path': self.db_path, 'hits': self._disk_hits, 'misses': self._disk_misses}
+        return stats
@@ -0,0 +1,283 @@
+import logging
+import signal
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from process_pools import pool_context
+from resume_analyzer import analyze_resume_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class ResumeJobTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ResumeJobTimeout('Resume analysis timed out')
+
+
+# Runs inside a pool worker. Pool workers execute jobs on their main
+# thread, so SIGALRM can interrupt a parse that runs past its deadline.
+# Returns (analysis, timings) so the parent can record where time went.
+def run_resume_job(filename, data, timeout):
+    use_alarm = bool(timeout) and hasattr(signal, 'setitimer')
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    timings = {}
+    try:
+        return analyze_resume_bytes(filename, data, timings), timings
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+# Job queue backed by a process pool, so PDF/DOCX parsing never runs on a
+# web worker thread. Finished jobs are kept for `result_ttl` seconds for
+# polling, then dropped. on_finished(status, timings), if given, is called
+# for every finished job; timings is empty unless the job succeeded.
+#
+# Jobs run in the process that accepted them, and without a `store` only
+# that process can answer a poll. With several web workers, pass a store
+# (create(job), finish(job), get(job_id); see ResumeJobRepository): every
+# job is written through to it, and get() falls back to it for jobs owned
+# by another worker. Those read as 'queued' until they finish, since only
+# the owner can see that a job is running.
+class ResumeJobQueue:
+    def __init__(self, workers=2, timeout=30.0, max_pending=100, result_ttl=600.0, on_finished=None,
+                 store=None):
+        self.workers = max(1, int(workers))
+        self.on_finished = on_finished
+        self.store = store
+        self.timeout = float(timeout)
+        self.max_pending = int(max_pending)
+        self.result_ttl = float(result_ttl)
+
+        self._executor = None
+        self._jobs = OrderedDict()  # job_id -> job dict, in submission order
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    # on_complete(analysis) runs on the pool's callback thread after success
+    def submit(self, filename, data, on_complete=None):
+        with self._lock:
+            self._purge_expired()
+            if self._pending >= self.max_pending:
+                raise QueueFullError('Resume analysis queue is full, try again shortly')
+
+            job_id = uuid.uuid4().hex
+            job = {
+                'id': job_id,
+                'filename': filename,
+                'status': 'queued',
+                'submitted_at': time.time(),
+                'finished_at': None,
+                'analysis': None,
+                'error': None
+            }
+            self._jobs[job_id] = job
+            self._pending += 1
+
+            try:
+                future = self._submit(filename, data)
+            except Exception:
+                del self._jobs[job_id]
+                self._pending -= 1
+                raise
+            job['future'] = future
+
+        self._persist('create', job)
+        future.add_done_callback(lambda f: self._finish(job_id, f, on_complete))
+        return job_id
+
+    # Analyzes a batch on the same pool without holding it in memory.
+    # `files` yields (key, filename, data) and is only advanced while fewer
+    # than `window` files are in flight; `data` may instead be an exception
+    # for a file that couldn't be read. lookup(key), if given, returns a
+    # cached analysis or None. Yields (key, status, analysis, error,
+    # timings) as each file finishes, where status is 'done', 'cached',
+    # 'failed', 'timeout' or 'skipped'. Closing the generator early cancels
+    # the files that haven't started.
+    def run_batch(self, files, window=None, lookup=None):
+        window = max(1, int(window or self.workers * 2))
+        files = iter(files)
+        in_flight = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < window:
+                    item = next(files, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    key, filename, data = item
+                    if isinstance(data, Exception):
+                        yield key, 'skipped', None, str(data), {}
+                        continue
+                    cached = lookup(key) if lookup else None
+                    if cached is not None:
+                        yield key, 'cached', cached, None, {}
+                        continue
+                    with self._lock:
+                        in_flight[self._submit(filename, data)] = key
+                    # Only the pool's copy of the upload is kept from here
+                    del data, item
+
+                if not in_flight:
+                    return
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    status, analysis, error, timings = self._outcome(future)
+                    with self._lock:
+                        if status == 'done':
+                            self._completed += 1
+                        elif status == 'timeout':
+                            self._timed_out += 1
+                        else:
+                            self._failed += 1
+                    yield key, status, analysis, error, timings
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    # Records a job that is already done, e.g. answered from a result cache
+    def add_completed(self, filename, analysis):
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'filename': filename,
+            'status': 'done',
+            'submitted_at': now,
+            'finished_at': now,
+            'analysis': analysis,
+            'error': None
+        }
+        with self._lock:
+            self._purge_expired()
+            self._jobs[job_id] = job
+            self._completed += 1
+        self._persist('create', job)
+        return job_id
+
+    # Jobs this process owns are answered from memory, others from the
+    # store; store errors propagate to the caller
+    def get(self, job_id):
+        job = self._get_local(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get(job_id)
+        return job
+
+    def _get_local(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            result = {key: value for key, value in job.items() if key != 'future'}
+
+        future = job.get('future')
+        if result['status'] == 'queued' and future is not None and future.running():
+            result['status'] = 'running'
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'pending': self._pending,
+                'retained': len(self._jobs),
+                'completed': self._completed,
+                'failed': self._failed,
+                'timed_out': self._timed_out,
+                'shared': self.store is not None
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _finish(self, job_id, future, on_complete=None):
+        with self._lock:
+            self._pending -= 1
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['finished_at'] = time.time()
+            job.pop('future', None)
+
+            status, analysis, error, timings = self._outcome(future)
+            job['status'] = status
+            if status == 'done':
+                job['analysis'] = analysis
+                self._completed += 1
+            else:
+                job['error'] = error
+                if status == 'timeout':
+                    self._timed_out += 1
+                else:
+                    self._failed += 1
+
+        self._persist('finish', job)
+        if self.on_finished:
+            self.on_finished(status, timings)
+        if status == 'done' and on_complete:
+            on_complete(analysis)
+
+    # Writes through to the store outside the lock. A failed write leaves
+    # the job pollable on this worker only, so it is logged, not raised.
+    def _persist(self, operation, job):
+        if self.store is None:
+            return
+        try:
+            getattr(self.store, operation)({key: value for key, value in job.items() if key != 'future'})
+        except Exception as e:
+            logger.warning('Could not %s resume job %s in the shared store: %s', operation, job['id'], e)
+
+    # (status, analysis, error message, timings) of a finished future
+    @staticmethod
+    def _outcome(future):
+        error = Exception('Job was cancelled') if future.cancelled() else future.exception()
+        if error is None:
+            analysis, timings = future.result()
+            return 'done', analysis, None, timings
+        return 'timeout' if isinstance(error, ResumeJobTimeout) else 'failed', None, str(error), {}
+
+    # Callers hold self._lock
+    def _submit(self, filename, data):
+        try:
+            return self._get_executor().submit(run_resume_job, filename, data, self.timeout)
+        except BrokenProcessPool:
+            # A crashed worker poisons the whole pool; start a fresh one
+            self._executor = None
+            return self._get_executor().submit(run_resume_job, filename, data, self.timeout)
+
+    def _get_executor(self):
+        # Created on first use so importing the app doesn't start workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context(__name__))
+        return self._executor
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and job['finished_at'] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,195 @@
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # without NumPy, resume analyses are returned without matches
+    np = None
+
+AVAILABLE = np is not None
+
+# Resume-to-internship matching. The vocabulary is the resume analyzer's
+# keyword dictionary, so a resume's vector comes straight from the
+# keywords its analysis found, and each internship is scanned for the
+# same terms in skills_required and, at a lower weight, its description.
+# Terms are TF-IDF weighted over the catalog and rows are L2-normalized,
+# so a score is the cosine similarity, between 0 and 1.
+DESCRIPTION_WEIGHT = 0.5
+# Replaced rows stay in the matrix, masked out, until they make up this
+# share of its entries
+COMPACT_RATIO = 0.25
+
+
+def _empty(dtype):
+    return np.empty(0, dtype=dtype)
+
+
+# Sparse internship x term matrix in coordinate form: one (slot, column,
+# value) entry per term an internship contains. A changed internship gets
+# a new slot and its old slot is masked out, so a refresh only appends.
+# Scoring a resume is one sparse matrix-vector product (a bincount over
+# the entries) plus an argpartition for the top k.
+class CatalogMatrix:
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.columns = {term: column for column, term in enumerate(matcher.keywords)}
+        self.term_weights = np.array([matcher.weights[term] for term in matcher.keywords], dtype=np.float64)
+
+        self._slots = {}
+        self._ids = _empty(np.int64)
+        self._live = _empty(bool)
+        self._rows = _empty(np.int32)
+        self._cols = _empty(np.int32)
+        self._values = _empty(np.float32)
+        # (ids, live, rows, cols, normalized entry weights, idf), replaced
+        # as a whole so scoring never sees a half-applied update
+        self._state = (self._ids, self._live, self._rows, self._cols, _empty(np.float32),
+                       np.ones(len(self.columns)))
+
+    def __len__(self):
+        return len(self._slots)
+
+    # [(column, value)] for one internship
+    def vectorize(self, skills_required, description):
+        _, skill_terms = self.matcher.scan(skills_required or '')
+        _, description_terms = self.matcher.scan(description or '')
+        entries = []
+        for term in skill_terms | description_terms:
+            column = self.columns[term]
+            field_weight = 1.0 if term in skill_terms else DESCRIPTION_WEIGHT
+            entries.append((column, self.term_weights[column] * field_weight))
+        return entries
+
+    # Adds or replaces internships from (id, skills_required, description) rows
+    def update(self, documents):
+        rows, cols, values, ids = [], [], [], []
+        live = self._live.copy()
+        slots = dict(self._slots)
+        next_slot = len(self._ids)
+        for internship_id, skills_required, description in documents:
+            previous = slots.get(internship_id)
+            if previous is not None:
+                live[previous] = False
+            slots[internship_id] = next_slot
+            ids.append(internship_id)
+            for column, value in self.vectorize(skills_required, description):
+                rows.append(next_slot)
+                cols.append(column)
+                values.append(value)
+            next_slot += 1
+        if not ids:
+            return
+
+        self._slots = slots
+        self._ids = np.concatenate([self._ids, np.array(ids, dtype=np.int64)])
+        self._live = np.concatenate([live, np.ones(len(ids), dtype=bool)])
+        self._rows = np.concatenate([self._rows, np.array(rows, dtype=np.int32)])
+        self._cols = np.concatenate([self._cols, np.array(cols, dtype=np.int32)])
+        self._values = np.concatenate([self._values, np.array(values, dtype=np.float32)])
+
+        dead = len(self._ids) - len(self._slots)
+        if dead and dead >= COMPACT_RATIO * len(self._ids):
+            self._compact()
+        self._reweight()
+
+    # Drops the masked-out slots and renumbers the rest
+    def _compact(self):
+        keep = np.flatnonzero(self._live)
+        renumber = np.full(len(self._ids), -1, dtype=np.int64)
+        renumber[keep] = np.arange(len(keep))
+        entries = self._live[self._rows]
+        self._ids = self._ids[keep]
+        self._live = np.ones(len(keep), dtype=bool)
+        self._rows = renumber[self._rows[entries]].astype(np.int32)
+        self._cols = self._cols[entries]
+        self._values = self._values[entries]
+        self._slots = {int(internship_id): slot for slot, internship_id in enumerate(self._ids)}
+
+    # Document frequencies, IDF and row norms change with every update
+    def _reweight(self):
+        slot_count = len(self._ids)
+        entry_live = self._live[self._rows]
+        doc_freq = np.bincount(self._cols[entry_live], minlength=len(self.columns))
+        total = int(self._live.sum())
+        idf = np.log((total + 1) / (doc_freq + 1)) + 1
+
+        weights = self._values * idf[self._cols]
+        weights[~entry_live] = 0
+        norms = np.sqrt(np.bincount(self._rows, weights=weights * weights, minlength=slot_count))
+        norms[norms == 0] = 1
+        weights = (weights / norms[self._rows]).astype(np.float32)
+        self._state = (self._ids, self._live, self._rows, self._cols, weights, idf)
+
+    # Best k (internship_id, score) pairs for a resume's keywords, ordered
+    # by score desc, id asc. Internships sharing no term are left out.
+    def top(self, keywords, k):
+        ids, live, rows, cols, weights, idf = self._state
+        columns = [self.columns[term] for term in keywords if term in self.columns]
+        if not columns or not len(ids) or k <= 0:
+            return []
+
+        query = np.zeros(len(self.columns))
+        query[columns] = self.term_weights[columns] * idf[columns]
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        query /= norm
+        scores = np.bincount(rows, weights=weights * query[cols], minlength=len(ids))
+        scores[~live] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            # Everything tied with the k-th score is kept, so ties are
+            # broken by id rather than by partition order
+            kth = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= kth]
+        order = np.lexsort((ids[candidates], -scores[candidates]))[:k]
+        return [(int(ids[slot]), round(float(scores[slot]), 4)) for slot in candidates[order]]
+
+
+# A CatalogMatrix kept in step with the database. load(after_version)
+# returns (version, documents changed since after_version); it's called
+# at most once per refresh_interval, and only one thread refreshes at a
+# time while the others keep scoring against the current matrix.
+class ResumeMatcher:
+    def __init__(self, matcher, load, refresh_interval=30.0):
+        self.matrix = CatalogMatrix(matcher)
+        self.load = load
+        self.refresh_interval = refresh_interval
+        self.version = None
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._refreshes = 0
+        self._refresh_seconds = 0.0
+
+    def refresh(self, force=False):
+        if not force and time.monotonic() - self._checked < self.refresh_interval:
+            return
+        # Until the first load finishes, callers wait for it
+        if not self._lock.acquire(blocking=self.version is None):
+            return
+        try:
+            if not force and time.monotonic() - self._checked < self.refresh_interval:
+                return
+            started = time.perf_counter()
+            version, documents = self.load(self.version)
+            self.matrix.update(documents)
+            self.version = version
+            self._checked = time.monotonic()
+            self._refreshes += 1
+            self._refresh_seconds = time.perf_counter() - started
+        finally:
+            self._lock.release()
+
+    def match(self, keywords, k):
+        self.refresh()
+        return self.matrix.top(keywords, k)
+
+    def stats(self):
+        return {
+            'internships': len(self.matrix),
+            'terms': len(self.matrix.columns),
+            'version': self.version,
+            'refreshes': self._refreshes,
+            'last_refresh_seconds': round(self._refresh_seconds, 3)
+        }
@@ -0,0 +1,126 @@
+import re
+
+from ingest import INTERNSHIP_COLUMNS
+
+# Full-text search over internship title, company, location and
+# description, on the storage engine's own text index: a FULLTEXT index in
+# MySQL and an FTS5 table in SQLite. Both stay in step with the table on
+# every write, so there is nothing to rebuild. Titles count for more than
+# the other columns.
+TITLE_WEIGHT = 2.0
+MAX_TERMS = 16
+
+SEARCH_INDEXES = [
+    'CREATE FULLTEXT INDEX ft_internships_text ON internships(title, company, location, description)',
+    'CREATE FULLTEXT INDEX ft_internships_title ON internships(title)'
+]
+
+# External-content FTS5 table: the text lives only in `internships`, and
+# the triggers keep the index in step with inserts, upserts and deletes
+SQLITE_SEARCH_INDEXES = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS internships_fts USING fts5(
+        title, company, location, description,
+        content='internships', content_rowid='id', tokenize='unicode61'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS internships_fts_insert AFTER INSERT ON internships BEGIN
+        INSERT INTO internships_fts (rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS internships_fts_delete AFTER DELETE ON internships BEGIN
+        INSERT INTO internships_fts (internships_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS internships_fts_update AFTER UPDATE ON internships BEGIN
+        INSERT INTO internships_fts (internships_fts, rowid, title, company, location, description)
+        VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        INSERT INTO internships_fts (rowid, title, company, location, description)
+        VALUES (new.id, new.title, new.company, new.location, new.description);
+    END
+    ''',
+    "INSERT INTO internships_fts (internships_fts) VALUES ('rebuild')"
+]
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+# Lower-cased words of a free-text query, deduplicated, at most MAX_TERMS.
+# Operators are dropped, so user input is never parsed as query syntax.
+def search_terms(text):
+    terms = []
+    for term in _TERM.findall((text or '').lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+# '!' rather than backslash as the LIKE escape, since MySQL and SQLite
+# disagree on backslashes in string literals
+def _like_pattern(value):
+    escaped = value.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+    return f'%{escaped}%'
+
+
+# One page of (row, score) matches for any of `terms`, best first, ties
+# broken by id. `after` is the (score, id) keyset of the previous page.
+# Scores are left unrounded: close matches stay in relevance order, and a
+# float survives the JSON cursor exactly, so the keyset still compares
+# equal against the recomputed score.
+# `type` matches exactly and `location` as a substring, both ignoring case.
+# Matches are ranked and paged on (id, score) alone; full rows are only
+# joined in for the page.
+def search_internships(cursor, dialect, terms, type=None, location=None, limit=20, after=None):
+    filters = ''
+    filter_params = []
+    if type:
+        filters += ' AND LOWER(i.type) = LOWER(%s)'
+        filter_params.append(type)
+    if location:
+        filters += " AND i.location LIKE %s ESCAPE '!'"
+        filter_params.append(_like_pattern(location))
+
+    if dialect == 'sqlite':
+        # bm25() is lower for better matches; column weights follow the
+        # fts5 column order. The table is only joined when filtering.
+        join = 'JOIN internships i ON i.id = internships_fts.rowid' if filters else ''
+        ranked = f'''
+            SELECT internships_fts.rowid AS id,
+                   -bm25(internships_fts, {TITLE_WEIGHT}, 1.0, 1.0, 1.0) AS score
+            FROM internships_fts {join}
+            WHERE internships_fts MATCH %s {filters}
+        '''
+        params = [' OR '.join(f'"{term}"' for term in terms)] + filter_params
+    else:
+        text = ' '.join(terms)
+        ranked = f'''
+            SELECT i.id,
+                {TITLE_WEIGHT} * MATCH(i.title) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                + MATCH(i.title, i.company, i.location, i.description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                AS score
+            FROM internships i
+            WHERE MATCH(i.title, i.company, i.location, i.description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+            {filters}
+        '''
+        params = [text, text, text] + filter_params
+
+    page = f'SELECT id, score FROM ({ranked}) ranked'
+    if after is not None:
+        page += ' WHERE score < %s OR (score = %s AND id > %s)'
+        params += [after[0], after[0], after[1]]
+    page += ' ORDER BY score DESC, id LIMIT %s'
+    params.append(limit)
+
+    columns = ', '.join('i.' + column for column in INTERNSHIP_COLUMNS)
+    cursor.execute(f'''
+        SELECT {columns}, p.score AS score
+        FROM ({page}) p
+        JOIN internships i ON i.id = p.id
+        ORDER BY p.score DESC, p.id
+    ''', params)
+    return [(row, float(row['score'])) for row in cursor.fetchall()]
@@ -0,0 +1,173 @@
+import re
+
+# Normalized skill tables. Skills are stored once in `skills` under a
+# canonical (trimmed, lower-cased) name, and the join tables act as an
+# inverted index from skill id to internships/users.
+SKILL_INDEX_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(191) NOT NULL UNIQUE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS internship_skills (
+        skill_id INT NOT NULL,
+        internship_id INT NOT NULL,
+        PRIMARY KEY (skill_id, internship_id),
+        KEY idx_internship_skills_internship_id (internship_id),
+        FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE,
+        FOREIGN KEY (internship_id) REFERENCES internships (id) ON DELETE CASCADE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS user_skills (
+        user_id INT NOT NULL,
+        skill_id INT NOT NULL,
+        PRIMARY KEY (user_id, skill_id),
+        KEY idx_user_skills_skill_id (skill_id),
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE
+    )
+    '''
+]
+
+SQLITE_SKILL_INDEX_TABLES = [
+    '''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS internship_skills (
+        skill_id INTEGER NOT NULL,
+        internship_id INTEGER NOT NULL,
+        PRIMARY KEY (skill_id, internship_id),
+        FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE,
+        FOREIGN KEY (internship_id) REFERENCES internships (id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_internship_skills_internship_id ON internship_skills(internship_id)',
+    '''
+    CREATE TABLE IF NOT EXISTS user_skills (
+        user_id INTEGER NOT NULL,
+        skill_id INTEGER NOT NULL,
+        PRIMARY KEY (user_id, skill_id),
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+        FOREIGN KEY (skill_id) REFERENCES skills (id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_user_skills_skill_id ON user_skills(skill_id)'
+]
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def canonical_skill(name):
+    return _WHITESPACE.sub(' ', name or '').strip().lower()
+
+
+# Accepts either the comma-separated column format or a list of names,
+# and returns unique canonical names in their original order
+def parse_skills(skills):
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(',')
+
+    seen = []
+    for skill in skills:
+        name = canonical_skill(skill)
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def ensure_skill_ids(cursor, skills):
+    names = parse_skills(skills)
+    if not names:
+        return {}
+
+    placeholders = ', '.join(['(%s)'] * len(names))
+    cursor.execute(f'INSERT IGNORE INTO skills (name) VALUES {placeholders}', names)
+
+    placeholders = ', '.join(['%s'] * len(names))
+    cursor.execute(f'SELECT id, name FROM skills WHERE name IN ({placeholders})', names)
+    return {row['name']: row['id'] for row in _dict_rows(cursor)}
+
+
+def index_internship_skills(cursor, internship_id, skills):
+    skill_ids = ensure_skill_ids(cursor, skills)
+    if not skill_ids:
+        return
+    placeholders = ', '.join(['(%s, %s)'] * len(skill_ids))
+    params = []
+    for skill_id in skill_ids.values():
+        params.extend((skill_id, internship_id))
+    cursor.execute(f'INSERT IGNORE INTO internship_skills (skill_id, internship_id) VALUES {placeholders}', params)
+
+
+def index_user_skills(cursor, user_id, skills):
+    skill_ids = ensure_skill_ids(cursor, skills)
+    if not skill_ids:
+        return
+    placeholders = ', '.join(['(%s, %s)'] * len(skill_ids))
+    params = []
+    for skill_id in skill_ids.values():
+        params.extend((user_id, skill_id))
+    cursor.execute(f'INSERT IGNORE INTO user_skills (user_id, skill_id) VALUES {placeholders}', params)
+
+
+# Replace the index rows of many internships at once, e.g. after a bulk
+# upsert where existing postings may have changed their skills
+def reindex_internships(cursor, skills_by_internship):
+    if not skills_by_internship:
+        return
+    internship_ids = list(skills_by_internship)
+    placeholders = ', '.join(['%s'] * len(internship_ids))
+    cursor.execute(f'DELETE FROM internship_skills WHERE internship_id IN ({placeholders})', internship_ids)
+
+    parsed = {internship_id: parse_skills(skills) for internship_id, skills in skills_by_internship.items()}
+    skill_ids = ensure_skill_ids(cursor, sorted({name for names in parsed.values() for name in names}))
+
+    params = []
+    for internship_id, names in parsed.items():
+        for name in names:
+            if name in skill_ids:
+                params.extend((skill_ids[name], internship_id))
+    if params:
+        placeholders = ', '.join(['(%s, %s)'] * (len(params) // 2))
+        cursor.execute(f'INSERT IGNORE INTO internship_skills (skill_id, internship_id) VALUES {placeholders}', params)
+
+
+# Index every internship/user that has no join rows yet. Safe to re-run:
+# already-indexed rows are skipped by the NOT EXISTS filter.
+def backfill_skill_index(cursor):
+    cursor.execute('''
+        SELECT i.id, i.skills_required AS skills FROM internships i
+        WHERE NOT EXISTS (SELECT 1 FROM internship_skills s WHERE s.internship_id = i.id)
+    ''')
+    internships = _dict_rows(cursor)
+    for row in internships:
+        index_internship_skills(cursor, row['id'], row['skills'])
+
+    cursor.execute('''
+        SELECT u.id, u.skills FROM users u
+        WHERE u.skills IS NOT NULL AND u.skills <> ''
+          AND NOT EXISTS (SELECT 1 FROM user_skills s WHERE s.user_id = u.id)
+    ''')
+    users = _dict_rows(cursor)
+    for row in users:
+        index_user_skills(cursor, row['id'], row['skills'])
+
+    return len(internships), len(users)
+
+
+# Works with both plain and dictionary cursors
+def _dict_rows(cursor):
+    rows = cursor.fetchall()
+    if rows and not isinstance(rows[0], dict):
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in rows]
+    return rows
@@ -0,0 +1,242 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from flask import Response
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # without the Brotli package only gzip is offered
+    brotli = None
+
+# Frontend files, read once at startup and served from memory. Each
+# compressed variant is built on the first request that asks for it and
+# kept, so startup only pays for reading and hashing. Every file carries
+# a strong ETag derived from its content, so a browser revalidating an
+# unchanged page gets a bodyless 304. Files whose names embed their own
+# SHA-256 (app.3f9a1c2b.js, at least 8 hex digits of it) never change
+# under that name and are cached for a year; everything else, including
+# Project.html and names that merely look hashed, is revalidated on
+# every use.
+SERVED_EXTENSIONS = {
+    '.html', '.css', '.js', '.mjs', '.map', '.json', '.txt', '.svg', '.xml', '.webmanifest',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico', '.woff', '.woff2'
+}
+COMPRESSED_EXTENSIONS = {'.html', '.css', '.js', '.mjs', '.map', '.json', '.txt', '.svg', '.xml', '.webmanifest'}
+SKIPPED_DIRS = {'node_modules'}
+SKIPPED_FILES = {'package.json', 'package-lock.json'}
+# Below this size the compression framing outweighs the savings
+MIN_COMPRESS_BYTES = 256
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Preferred first when the client accepts both equally
+ENCODINGS = ('br', 'gzip')
+
+_FINGERPRINT = re.compile(r'\.([0-9a-f]{8,64})(?=\.[^./]+$)')
+
+
+def _compress(encoding, data):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the gzip bytes identical across restarts and workers
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class Asset:
+    def __init__(self, name, data, mtime):
+        self.name = name
+        self.mtime = mtime
+        sha256 = hashlib.sha256(data).hexdigest()
+        self.digest = sha256[:32]
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'image/svg+xml'):
+            content_type += '; charset=utf-8'
+        self.content_type = content_type
+        fingerprint = _FINGERPRINT.search(name)
+        self.immutable = bool(fingerprint) and sha256.startswith(fingerprint.group(1))
+
+        self.data = data
+        self.encodings = ()
+        if os.path.splitext(name)[1].lower() in COMPRESSED_EXTENSIONS and len(data) >= MIN_COMPRESS_BYTES:
+            self.encodings = tuple(e for e in ENCODINGS if e != 'br' or brotli is not None)
+        self._bodies = {'identity': data}
+
+    # (encoding, body) for the requested encoding, or identity when that
+    # encoding doesn't come out smaller. Two threads racing on the first
+    # request both compress, and both get the same bytes.
+    def body(self, encoding):
+        body = self._bodies.get(encoding)
+        if body is None:
+            body = _compress(encoding, self.data)
+            if len(body) >= len(self.data):
+                body = False
+            self._bodies[encoding] = body
+        if body is False:
+            return 'identity', self.data
+        return encoding, body
+
+    # Each encoding is a different representation and needs its own strong
+    # validator; they share the content digest so a revalidation matches
+    # whichever one the client has cached
+    def etag(self, encoding):
+        if encoding == 'identity':
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+    def fingerprinted_name(self):
+        stem, extension = os.path.splitext(self.name)
+        return f'{stem}.{self.digest[:12]}{extension}'
+
+
+# {coding: q} from an Accept-Encoding header
+def parse_accept_encoding(header):
+    codings = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+# The best encoding of `available` the client accepts; identity when none is
+def choose_encoding(header, available):
+    codings = parse_accept_encoding(header)
+    best, best_q = 'identity', 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = codings.get(encoding, codings.get('*', 0.0))
+        if encoding == 'gzip':
+            q = max(q, codings.get('x-gzip', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+# Weak comparison, as If-None-Match requires, against any encoding of the
+# asset's content
+def etag_matches(header, digest):
+    for tag in (header or '').split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"').split('-', 1)[0] == digest:
+            return True
+    return False
+
+
+class StaticAssets:
+    def __init__(self, root, index='Project.html', auto_reload=False):
+        self.root = os.path.abspath(root)
+        self.index = index
+        self.auto_reload = auto_reload
+        self._assets = {}
+        self._aliases = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def _servable(self, name):
+        basename = os.path.basename(name)
+        if basename.startswith('.') or basename in SKIPPED_FILES:
+            return False
+        return os.path.splitext(basename)[1].lower() in SERVED_EXTENSIONS
+
+    def _read(self, name):
+        path = os.path.join(self.root, *name.split('/'))
+        with open(path, 'rb') as f:
+            data = f.read()
+        return Asset(name, data, os.path.getmtime(path))
+
+    def load(self):
+        assets = {}
+        if os.path.isdir(self.root):
+            for directory, dirs, files in os.walk(self.root):
+                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIPPED_DIRS]
+                for filename in files:
+                    name = os.path.relpath(os.path.join(directory, filename), self.root).replace(os.sep, '/')
+                    if self._servable(name):
+                        assets[name] = self._read(name)
+        with self._lock:
+            self._assets = assets
+            self._aliases = {asset.fingerprinted_name(): name for name, asset in assets.items()}
+
+    # Path to link an asset by so that it is cached as immutable, e.g.
+    # "logo.1c0f3e9ab2d4.png"; None for unknown names
+    def url_for(self, name):
+        asset = self.lookup(name)
+        return '/' + asset.fingerprinted_name() if asset else None
+
+    def lookup(self, name):
+        with self._lock:
+            asset = self._assets.get(name)
+            if asset is None and name in self._aliases:
+                asset = self._assets.get(self._aliases[name])
+                return asset if asset and asset.fingerprinted_name() == name else None
+        if self.auto_reload and self._servable(name):
+            asset = self._reload(name, asset)
+        return asset
+
+    # Development: pick up edits without a restart
+    def _reload(self, name, asset):
+        path = safe_join(self.root, name)
+        if path is None:
+            return asset
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return asset
+        if asset is not None and asset.mtime == mtime:
+            return asset
+        asset = self._read(name)
+        with self._lock:
+            self._assets[name] = asset
+            self._aliases[asset.fingerprinted_name()] = name
+        return asset
+
+    # The response for `name`, or None when there is no such asset
+    def serve(self, name, request):
+        name = name or self.index
+        asset = self.lookup(name)
+        if asset is None:
+            return None
+
+        encoding, body = asset.body(choose_encoding(request.headers.get('Accept-Encoding'), asset.encodings))
+        headers = {
+            'ETag': asset.etag(encoding),
+            'Cache-Control': IMMUTABLE if asset.immutable or name != asset.name else REVALIDATE,
+            'Vary': 'Accept-Encoding'
+        }
+        if etag_matches(request.headers.get('If-None-Match'), asset.digest):
+            return Response(status=304, headers=headers)
+
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(body, headers=headers, content_type=asset.content_type)
+
+    def stats(self):
+        with self._lock:
+            assets = list(self._assets.values())
+        return {
+            'root': self.root,
+            'assets': len(assets),
+            'bytes': sum(len(asset.data) for asset in assets),
+            'encodings': list(ENCODINGS if brotli else ENCODINGS[1:])
+        }
@@ -0,0 +1,320 @@
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import mysql.connector
+    from mysql.connector import errorcode
+except ImportError:  # SQLite-only deployments don't need the MySQL driver
+    mysql = None
+
+# Storage engines. Both hand out DB-API connections whose cursors take
+# MySQL-flavoured SQL (%s placeholders, INSERT IGNORE, ON DUPLICATE KEY
+# UPDATE); the SQLite engine rewrites those few constructs, so the
+# repositories and helper modules share one set of queries. Statements
+# that have no common form branch on `dialect`.
+
+
+class StorageUnavailable(Exception):
+    pass
+
+
+# Catch these instead of a driver's own Error class
+DATABASE_ERRORS = (StorageUnavailable, sqlite3.Error) + ((mysql.connector.Error,) if mysql else ())
+
+
+def is_duplicate_key(error):
+    if isinstance(error, sqlite3.IntegrityError):
+        return 'UNIQUE constraint failed' in str(error)
+    return mysql is not None and getattr(error, 'errno', None) == errorcode.ER_DUP_ENTRY
+
+
+def dialect_of(conn):
+    return getattr(conn, 'dialect', 'mysql')
+
+
+class MySQLStorage:
+    dialect = 'mysql'
+    # What table_stats counts are: InnoDB's sampled guesses can be off in
+    # either direction
+    row_estimate = 'approximate'
+
+    def __init__(self, config, pool_size=10, pool_timeout=5.0, ping_interval=30.0):
+        if mysql is None:
+            raise StorageUnavailable('DB_ENGINE=mysql needs mysql-connector-python installed')
+        from db_pool import ConnectionPool
+
+        self.config = dict(config)
+        self.pool = ConnectionPool(self.config, size=pool_size, timeout=pool_timeout, ping_interval=ping_interval)
+
+    # Borrows a pooled connection; release rolls back anything uncommitted
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.pool.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.pool.release(conn)
+
+    # A dedicated connection for CLI tools and migrations
+    def connect(self):
+        return mysql.connector.connect(**self.config)
+
+    def ensure_database(self):
+        server_config = {key: value for key, value in self.config.items() if key != 'database'}
+        conn = mysql.connector.connect(**server_config)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{self.config['database']}`")
+            cursor.close()
+        finally:
+            conn.close()
+
+    # Row counts are InnoDB's estimates, a catalog lookup instead of a scan
+    def table_stats(self, cursor):
+        cursor.execute('''
+            SELECT TABLE_NAME AS name, TABLE_ROWS AS row_estimate
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME
+        ''')
+        return {row['name']: int(row['row_estimate'] or 0) for row in cursor.fetchall()}
+
+    def stats(self):
+        return dict(self.pool.stats(), engine=self.dialect)
+
+    def close(self):
+        self.pool.close_all()
+
+
+# SQLite in WAL mode: readers never block the writer, and one file serves
+# a single node without a database server. Each thread keeps its own
+# connection (sqlite3 connections aren't shareable across threads), and
+# each connection caches compiled statements, so repeated queries skip
+# the parse/plan step.
+class SQLiteStorage:
+    dialect = 'sqlite'
+    # MAX(rowid) never undercounts; deleted rows leave gaps below it
+    row_estimate = 'upper_bound'
+
+    def __init__(self, path, busy_timeout=5.0, statement_cache=256):
+        self.path = path
+        self.busy_timeout = float(busy_timeout)
+        self.statement_cache = int(statement_cache)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self.connect()
+            with self._lock:
+                self._opened += 1
+        # Nested blocks on one thread share the connection; only the
+        # outermost one ends the transaction
+        conn.depth += 1
+        try:
+            yield conn
+        finally:
+            conn.depth -= 1
+            if conn.depth == 0:
+                conn.rollback()
+
+    def connect(self):
+        # PARSE_DECLTYPES returns TIMESTAMP/DATE columns as datetime/date,
+        # as the MySQL driver does
+        raw = sqlite3.connect(self.path, timeout=self.busy_timeout, cached_statements=self.statement_cache,
+                              detect_types=sqlite3.PARSE_DECLTYPES)
+        raw.execute('PRAGMA journal_mode=WAL')
+        raw.execute('PRAGMA synchronous=NORMAL')
+        raw.execute('PRAGMA foreign_keys=ON')
+        return SQLiteConnection(raw)
+
+    def ensure_database(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+    # SQLite keeps no row estimates, but MAX(rowid) is an index lookup and
+    # matches the count for tables that are rarely deleted from. WITHOUT
+    # ROWID tables have no cheap estimate and report None. Virtual tables
+    # (the FTS5 index) and the shadow tables backing them, named
+    # <virtual table>_<suffix>, are left out.
+    def table_stats(self, cursor):
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%%' ORDER BY name")
+        rows = cursor.fetchall()
+        virtual = [row['name'] for row in rows if (row['sql'] or '').upper().startswith('CREATE VIRTUAL')]
+        tables = [
+            row['name'] for row in rows
+            if row['name'] not in virtual and not any(row['name'].startswith(name + '_') for name in virtual)
+        ]
+        counts = {}
+        for table in tables:
+            try:
+                cursor.execute(f'SELECT MAX(rowid) AS row_estimate FROM "{table}"')
+                counts[table] = int(cursor.fetchone()['row_estimate'] or 0)
+            except sqlite3.OperationalError:
+                counts[table] = None
+        return counts
+
+    def stats(self):
+        with self._lock:
+            return {'engine': self.dialect, 'path': self.path, 'connections_opened': self._opened}
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class SQLiteConnection:
+    dialect = 'sqlite'
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.depth = 0
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self.raw.cursor(), dictionary)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+    # Takes the write lock now rather than at the first write, so a
+    # read-then-write sequence can't interleave with another writer
+    def begin_immediate(self):
+        if not self.raw.in_transaction:
+            self.raw.execute('BEGIN IMMEDIATE')
+
+
+class SQLiteCursor:
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        if dictionary:
+            cursor.row_factory = _dict_row
+
+    def execute(self, operation, params=None):
+        self._cursor.execute(translate_sql(operation), tuple(params or ()))
+        return None
+
+    def executemany(self, operation, seq_params):
+        self._cursor.executemany(translate_sql(operation), [tuple(params) for params in seq_params])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+_ON_DUPLICATE = re.compile(r'ON\s+DUPLICATE\s+KEY\s+UPDATE', re.IGNORECASE)
+_VALUES_REF = re.compile(r'\bVALUES\((\w+)\)', re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE)
+
+
+# Rewrites the MySQL constructs the shared queries use into SQLite.
+# ON CONFLICT without a target (SQLite 3.35+) matches ON DUPLICATE KEY,
+# which also fires on any unique key.
+@functools.lru_cache(maxsize=512)
+def translate_sql(sql):
+    sql = _INSERT_IGNORE.sub('INSERT OR IGNORE', sql)
+    match = _ON_DUPLICATE.search(sql)
+    if match:
+        head, tail = sql[:match.start()], sql[match.end():]
+        sql = head + 'ON CONFLICT DO UPDATE SET' + _VALUES_REF.sub(r'excluded.\1', tail)
+    return sql.replace('%s', '?').replace('%%', '%')
+
+
+# The database file bundled with the repo
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'internconnect.db')
+
+
+# DB_ENGINE=mysql (default) or sqlite; SQLITE_PATH picks the database file
+def create_storage(mysql_config):
+    engine = os.environ.get('DB_ENGINE', 'mysql').lower()
+    if engine == 'sqlite':
+        return SQLiteStorage(
+            os.environ.get('SQLITE_PATH', DEFAULT_SQLITE_PATH),
+            busy_timeout=float(os.environ.get('SQLITE_BUSY_TIMEOUT', 5))
+        )
+    if engine != 'mysql':
+        raise ValueError(f'Unknown DB_ENGINE {engine!r}; expected mysql or sqlite')
+    return MySQLStorage(
+        mysql_config,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        pool_timeout=float(os.environ.get('DB_POOL_TIMEOUT', 5)),
+        ping_interval=float(os.environ.get('DB_POOL_PING_INTERVAL', 30))
+    )
+
+
+_STATEMENT_VERB = re.compile(r'^\s*(\w+)')
+_STATEMENT_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE)\s+`?(\w+)', re.IGNORECASE)
+
+
+# Low-cardinality label for a SQL statement, e.g. "select users"
+def statement_label(sql):
+    verb = _STATEMENT_VERB.match(sql)
+    table = _STATEMENT_TABLE.search(sql)
+    label = verb.group(1).lower() if verb else 'unknown'
+    return f'{label} {table.group(1).lower()}' if table else label
+
+
+# Cursor wrapper that reports every execute() to observe(label, seconds,
+# ok). Everything else is passed through to the wrapped cursor.
+class TimedCursor:
+    def __init__(self, cursor, observe):
+        self._cursor = cursor
+        self._observe = observe
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = self._cursor.execute(operation, params, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            self._observe(statement_label(operation), time.perf_counter() - started, ok)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
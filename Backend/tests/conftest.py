@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# Backend modules use flat imports, so tests run with Backend/ on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# The app reads its settings from the environment at import, so it is
+# imported once per session against a fresh, migrated SQLite database
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    os.environ.update({
+        'DB_ENGINE': 'sqlite',
+        'SQLITE_PATH': str(tmp_path_factory.mktemp('db') / 'internconnect.db'),
+        'PASSWORD_HASH_WORKERS': '0',
+        'LOG_LEVEL': 'WARNING'
+    })
+    from config import DB_CONFIG
+    from migrations import migrate
+    from storage import create_storage
+
+    migrate(create_storage(DB_CONFIG))
+
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,62 @@
+import threading
+import time
+
+from event_sink import BufferedEventSink
+
+
+def test_close_writes_everything_queued():
+    written = []
+    sink = BufferedEventSink(written.extend, batch_size=10, flush_interval=5.0)
+    for event in range(25):
+        assert sink.put(event)
+    sink.close()
+    assert written == list(range(25))
+    assert sink.stats()['flushed'] == 25
+    assert not sink.put('late')
+
+
+def test_close_does_not_block_on_a_full_buffer():
+    writing = threading.Event()
+    release = threading.Event()
+    written = []
+
+    def write_batch(batch):
+        writing.set()
+        release.wait()
+        written.extend(batch)
+
+    sink = BufferedEventSink(write_batch, batch_size=1, capacity=2, put_timeout=0)
+    sink.put(0)
+    assert writing.wait(1.0)
+    for event in range(1, 10):
+        sink.put(event)
+    assert sink.stats()['pending'] == 2
+
+    started = time.monotonic()
+    sink.close(timeout=0.2)
+    assert time.monotonic() - started < 1.0
+
+    # The flusher still finishes the queued events once the writer recovers
+    release.set()
+    sink._thread.join(2.0)
+    assert not sink._thread.is_alive()
+    assert len(written) == 3
+    assert sink.stats()['dropped'] == 7
+
+
+def test_events_the_writer_skips_count_as_dropped():
+    sink = BufferedEventSink(lambda batch: len([event for event in batch if event % 2]), batch_size=10)
+    for event in range(10):
+        sink.put(event)
+    sink.close()
+    assert sink.stats()['flushed'] == 5
+    assert sink.stats()['dropped'] == 5
+
+
+def test_track_search_rejects_unknown_users_before_buffering(client, app_module):
+    queued = app_module.search_events.stats()['queued']
+    response = client.post('/api/track-search', json={
+        'user_id': 987654, 'platform': 'LinkedIn', 'skills': ['Python']
+    })
+    assert response.status_code == 404
+    assert app_module.search_events.stats()['queued'] == queued
@@ -0,0 +1,60 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def user_id(client, app_module):
+    response = client.post('/api/signup', json={
+        'name': 'Ada', 'phone': '555-0100', 'email': f'{uuid.uuid4().hex}@example.com',
+        'skills': ['Python', 'SQL'], 'password': 'correct horse'
+    })
+    user_id = response.get_json()['user']['id']
+    assert app_module.users.get_skills(user_id) == ['Python', 'SQL']
+    return user_id
+
+
+def apply(client, user_id, internship_ids, key=None):
+    headers = {'Idempotency-Key': key} if key else {}
+    return client.post('/api/applications/batch', headers=headers,
+                       json={'user_id': user_id, 'internship_ids': internship_ids})
+
+
+def test_retry_replays_the_stored_response(client, user_id):
+    first = apply(client, user_id, [1, 2], key='retry-1')
+    assert first.status_code == 200
+    assert first.get_json()['summary']['created'] == 2
+    assert 'Idempotent-Replayed' not in first.headers
+
+    retry = apply(client, user_id, [1, 2], key='retry-1')
+    assert retry.status_code == 200
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+
+
+def test_without_a_key_repeats_run_again(client, user_id):
+    apply(client, user_id, [3])
+    again = apply(client, user_id, [3])
+    assert again.get_json()['results'] == [{'internship_id': 3, 'status': 'already_applied'}]
+
+
+def test_key_reused_for_a_different_request(client, user_id):
+    apply(client, user_id, [1], key='reused')
+    response = apply(client, user_id, [2], key='reused')
+    assert response.status_code == 422
+
+
+def test_keys_are_scoped_per_user(client, user_id):
+    other = client.post('/api/signup', json={
+        'name': 'Grace', 'phone': '555-0101', 'email': f'{uuid.uuid4().hex}@example.com',
+        'skills': ['Java'], 'password': 'correct horse'
+    }).get_json()['user']['id']
+    apply(client, user_id, [1], key='shared')
+    response = apply(client, other, [1], key='shared')
+    assert response.status_code == 200
+    assert 'Idempotent-Replayed' not in response.headers
+    assert response.get_json()['summary']['created'] == 1
+
+
+def test_invalid_key(client, user_id):
+    assert apply(client, user_id, [1], key='x' * 101).status_code == 400
@@ -0,0 +1,53 @@
+from keyword_matcher import DEFAULT_KEYWORD_DICTIONARY, KeywordMatcher
+
+
+def matcher(keywords, sections=None):
+    return KeywordMatcher({'sections': sections or {}, 'keywords': {term: 1 for term in keywords}})
+
+
+def test_default_dictionary():
+    sections, keywords = KeywordMatcher(DEFAULT_KEYWORD_DICTIONARY).scan(
+        'Skills: Python, JavaScript, C++ and SQL. Education: BSc, Example University.'
+    )
+    assert keywords == {'python', 'javascript', 'c++', 'sql'}
+    assert sections == {'skills', 'education'}
+
+
+def test_whole_words_only():
+    _, keywords = matcher(['java', 'git', 'c++']).scan('JavaScript on github, c+++ and c++')
+    assert keywords == {'c++'}
+
+
+def test_shared_prefix_picks_each_term():
+    _, keywords = matcher(['java', 'javascript']).scan('Java and JavaScript')
+    assert keywords == {'java', 'javascript'}
+
+
+def test_prefix_nested_in_longer_term():
+    _, keywords = matcher(['react', 'react native']).scan('Built apps with React Native')
+    assert keywords == {'react', 'react native'}
+
+
+def test_suffix_nested_in_longer_term():
+    _, keywords = matcher(['learning', 'machine learning']).scan('Machine\n  Learning projects')
+    assert keywords == {'learning', 'machine learning'}
+
+
+def test_middle_word_nested_in_longer_term():
+    _, keywords = matcher(['data', 'big data pipelines']).scan('big data pipelines')
+    assert keywords == {'data', 'big data pipelines'}
+
+
+def test_overlapping_terms():
+    _, keywords = matcher(['data analysis', 'analysis tools']).scan('data analysis tools')
+    assert keywords == {'data analysis', 'analysis tools'}
+
+
+def test_term_shared_by_section_and_keyword():
+    sections, keywords = matcher(['project'], {'experience': ['project']}).scan('Project lead')
+    assert sections == {'experience'}
+    assert keywords == {'project'}
+
+
+def test_empty_dictionary():
+    assert KeywordMatcher({}).scan('anything') == (set(), set())
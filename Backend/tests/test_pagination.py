@@ -0,0 +1,53 @@
+import base64
+from datetime import datetime
+
+import pytest
+
+from pagination import USER_FIELDS, USER_KEY, decode_keyset, encode_keyset, paginate, parse_limit, select_list
+
+
+def test_keyset_round_trip():
+    row = {'applied_date': datetime(2026, 3, 1, 12, 30), 'id': 42, 'title': 'ignored'}
+    cursor = encode_keyset(row, ('applied_date', 'id'))
+    assert decode_keyset(cursor, (datetime.fromisoformat, int)) == (datetime(2026, 3, 1, 12, 30), 42)
+
+
+def test_missing_cursor_is_first_page():
+    assert decode_keyset(None, (int,)) is None
+    assert decode_keyset('', (int,)) is None
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    'é',
+    base64.urlsafe_b64encode(b'{"id": 1}').decode(),
+    base64.urlsafe_b64encode(b'[1, 2]').decode(),
+    base64.urlsafe_b64encode(b'["x"]').decode()
+])
+def test_invalid_keyset_cursors(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_keyset(cursor, (int,))
+
+
+def test_paginate_fetches_one_extra_row():
+    rows = [{'id': i} for i in range(1, 5)]
+    page, cursor = paginate(rows, 3, USER_KEY)
+    assert page == rows[:3]
+    assert decode_keyset(cursor, (int,)) == (3,)
+
+    page, cursor = paginate(rows[:3], 3, USER_KEY)
+    assert page == rows[:3] and cursor is None
+
+
+def test_parse_limit():
+    assert parse_limit(None) == 50
+    assert parse_limit('0') == 1
+    assert parse_limit('100000') == 500
+    with pytest.raises(ValueError):
+        parse_limit('ten')
+
+
+def test_select_list_always_includes_the_key():
+    assert select_list('name,email', USER_FIELDS, USER_KEY) == 'id, name, email'
+    with pytest.raises(ValueError, match='Unknown fields: password_hash'):
+        select_list('name,password_hash', USER_FIELDS, USER_KEY)
@@ -0,0 +1,21 @@
+import base64
+
+import pytest
+
+from recommend import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(0.8125, 7)) == (0.8125, 7)
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    base64.urlsafe_b64encode(b'[1, 2]').decode(),
+    base64.urlsafe_b64encode(b'{"s": 0.5}').decode(),
+    base64.urlsafe_b64encode(b'{"s": "high", "id": 1}').decode()
+])
+def test_invalid_cursors(cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor)
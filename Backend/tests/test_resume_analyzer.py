@@ -0,0 +1,33 @@
+from keyword_matcher import KeywordMatcher
+from resume_analyzer import LONG_RESUME_WORDS, analyze_resume_stream
+
+MATCHER = KeywordMatcher({
+    'sections': {'skills': ['skills'], 'education': ['education']},
+    'keywords': {'python': 10, 'sql': 10, 'docker': 1}
+})
+
+
+def pages(*texts):
+    return iter(texts)
+
+
+def filler(words):
+    return ' '.join(['word'] * words)
+
+
+def test_keywords_after_the_score_maxes_out_are_still_found():
+    analysis = analyze_resume_stream(pages(
+        'Skills: Python, SQL. Education: BSc. ' + filler(LONG_RESUME_WORDS),
+        filler(100) + ' Docker'
+    ), MATCHER)
+    assert analysis['keyword_analysis']['technical_skills']['found'] == ['python', 'sql', 'docker']
+    assert analysis['word_count'] > LONG_RESUME_WORDS + 100
+
+
+def test_stops_once_everything_is_found():
+    analysis = analyze_resume_stream(pages(
+        'Skills: Python, SQL, Docker. Education: BSc. ' + filler(LONG_RESUME_WORDS),
+        filler(100)
+    ), MATCHER)
+    assert analysis['truncated_reason'] == 'saturated'
+    assert analysis['keyword_analysis']['technical_skills']['missing'] == []
@@ -0,0 +1,47 @@
+from resume_analyzer import cacheable
+from resume_cache import ResumeResultCache
+
+
+def test_key_depends_on_version_extension_and_content():
+    cache = ResumeResultCache('v1')
+    key = cache.key_for('cv.PDF', b'data')
+    assert key == cache.key_for('other.pdf', b'data')
+    assert key != cache.key_for('cv.docx', b'data')
+    assert key != cache.key_for('cv.pdf', b'other data')
+    assert key != ResumeResultCache('v2').key_for('cv.pdf', b'data')
+
+
+def test_memory_round_trip():
+    cache = ResumeResultCache('v1')
+    key = cache.key_for('cv.pdf', b'data')
+    assert cache.get(key) is None
+    cache.set(key, {'score': 70})
+    assert cache.get(key) == {'score': 70}
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / 'results.db')
+    cache = ResumeResultCache('v1', db_path=db_path)
+    key = cache.key_for('cv.pdf', b'data')
+    cache.set(key, {'score': 70})
+
+    reopened = ResumeResultCache('v1', db_path=db_path)
+    assert reopened.get(key) == {'score': 70}
+    assert reopened.stats()['disk']['hits'] == 1
+
+
+def test_new_version_drops_old_disk_entries(tmp_path):
+    db_path = str(tmp_path / 'results.db')
+    old = ResumeResultCache('v1', db_path=db_path)
+    old.set(old.key_for('cv.pdf', b'data'), {'score': 70})
+
+    ResumeResultCache('v2', db_path=db_path)
+    reopened = ResumeResultCache('v1', db_path=db_path)
+    assert reopened.get(reopened.key_for('cv.pdf', b'data')) is None
+
+
+def test_deadline_truncated_analyses_are_not_cacheable():
+    assert cacheable({'truncated': False, 'truncated_reason': None})
+    assert cacheable({'truncated': True, 'truncated_reason': 'pages'})
+    assert cacheable({'truncated': True, 'truncated_reason': 'saturated'})
+    assert not cacheable({'truncated': True, 'truncated_reason': 'deadline'})
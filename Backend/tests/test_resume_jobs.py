@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from repositories import ResumeJobRepository
+from resume_jobs import ResumeJobQueue
+
+
+@pytest.fixture
+def store(app_module):
+    return ResumeJobRepository(app_module.db_cursor, ttl=600)
+
+
+def wait_for(queue, job_id, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job and job['status'] not in ('queued', 'running'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+# Two queues stand in for two gunicorn workers sharing one database
+def test_job_is_visible_to_other_workers(store):
+    owner = ResumeJobQueue(workers=1, store=store)
+    other = ResumeJobQueue(workers=1, store=store)
+    try:
+        job_id = owner.submit('cv.txt', b'Skills: Python, SQL. Education: BSc. Experience: internship.')
+        assert other.get(job_id)['status'] in ('queued', 'done')
+
+        job = wait_for(owner, job_id)
+        assert job['status'] == 'done'
+        assert other.get(job_id)['analysis'] == job['analysis']
+    finally:
+        owner.shutdown()
+
+
+def test_completed_jobs_are_shared(store):
+    owner = ResumeJobQueue(workers=1, store=store)
+    job_id = owner.add_completed('cv.pdf', {'ats_score': 70})
+    job = ResumeJobQueue(workers=1, store=store).get(job_id)
+    assert job['status'] == 'done'
+    assert job['analysis'] == {'ats_score': 70}
+
+
+def test_finish_written_before_create_is_kept(store):
+    job = {'id': 'f' * 32, 'filename': 'cv.pdf', 'status': 'done', 'submitted_at': time.time(),
+           'finished_at': time.time(), 'analysis': {'ats_score': 1}, 'error': None}
+    store.finish(job)
+    store.create(dict(job, status='queued', finished_at=None, analysis=None))
+    assert store.get(job['id'])['status'] == 'done'
+
+
+def test_unknown_and_expired_jobs(store):
+    assert store.get('0' * 32) is None
+    store.create({'id': 'e' * 32, 'filename': 'cv.pdf', 'status': 'queued', 'submitted_at': time.time() - 601,
+                  'finished_at': None, 'analysis': None, 'error': None})
+    assert store.get('e' * 32) is None
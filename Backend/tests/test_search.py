@@ -0,0 +1,21 @@
+QUERY = 'developer intern software'
+
+
+def test_scores_are_ranked_unrounded(app_module):
+    matches = app_module.internships.search(QUERY.split(), limit=100)
+    scores = [score for _, score in matches]
+    assert len(set(scores)) > len({round(score, 6) for score in scores})
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_pages_walk_the_full_ranking(client):
+    ranking = [row['id'] for row in client.get(f'/api/internships/search?q={QUERY}&limit=100').get_json()['internships']]
+
+    seen, cursor = [], ''
+    while True:
+        page = client.get(f'/api/internships/search?q={QUERY}&limit=1&cursor={cursor}').get_json()
+        seen += [row['id'] for row in page['internships']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert seen == ranking
@@ -0,0 +1,70 @@
+import gzip
+
+import pytest
+from werkzeug.test import EnvironBuilder
+
+from static_assets import StaticAssets, choose_encoding, etag_matches
+
+PAGE = b'<html><body>' + b'<p>internships</p>' * 200 + b'</body></html>'
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / 'Project.html').write_bytes(PAGE)
+    (tmp_path / 'tiny.css').write_bytes(b'a{}')
+    return StaticAssets(str(tmp_path))
+
+
+def request(**headers):
+    return EnvironBuilder(headers=headers).get_request()
+
+
+def test_choose_encoding():
+    assert choose_encoding('gzip, br', ('br', 'gzip')) == 'br'
+    assert choose_encoding('br;q=0.5, gzip', ('br', 'gzip')) == 'gzip'
+    assert choose_encoding('br;q=0', ('br', 'gzip')) == 'identity'
+    assert choose_encoding(None, ('br', 'gzip')) == 'identity'
+
+
+def test_etag_matches_any_encoding():
+    assert etag_matches('"abc-gzip"', 'abc')
+    assert etag_matches('W/"abc", "def"', 'abc')
+    assert not etag_matches('"def"', 'abc')
+
+
+def test_compresses_on_first_request_only(assets):
+    asset = assets.lookup('Project.html')
+    assert 'gzip' not in asset._bodies
+
+    response = assets.serve('', request(**{'Accept-Encoding': 'gzip'}))
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()) == PAGE
+    assert asset._bodies['gzip'] is not None
+
+
+def test_small_files_are_not_compressed(assets):
+    response = assets.serve('tiny.css', request(**{'Accept-Encoding': 'gzip'}))
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == b'a{}'
+
+
+def test_revalidation_and_fingerprinted_names(assets):
+    response = assets.serve('Project.html', request())
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    revalidated = assets.serve('Project.html', request(**{'If-None-Match': response.headers['ETag']}))
+    assert revalidated.status_code == 304
+
+    fingerprinted = assets.url_for('Project.html').lstrip('/')
+    response = assets.serve(fingerprinted, request())
+    assert response.headers['Cache-Control'].endswith('immutable')
+    assert assets.serve('missing.js', request()) is None
+
+
+def test_only_true_content_hashes_are_immutable(tmp_path):
+    (tmp_path / 'app.5f546eb4.css').write_bytes(b'a{}')
+    (tmp_path / 'build.deadbeef.css').write_bytes(b'a{}')
+    assets = StaticAssets(str(tmp_path))
+
+    assert assets.serve('app.5f546eb4.css', request()).headers['Cache-Control'].endswith('immutable')
+    assert assets.serve('build.deadbeef.css', request()).headers['Cache-Control'] == 'no-cache'